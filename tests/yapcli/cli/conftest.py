@@ -1,12 +1,54 @@
 from __future__ import annotations
 
-from typing import Iterator
+from pathlib import Path
+from typing import Callable, Iterator
 
 import pytest
+import questionary
 from typer.testing import CliRunner
 
 
-@pytest.fixture()
+def _fail_checkbox(*args, **kwargs):
+    raise AssertionError("questionary.checkbox should not be called")
+
+
+@pytest.fixture(scope="module")
 def runner() -> Iterator[CliRunner]:
-    """Provide a CLI runner."""
+    """Provide a CLI runner shared by the tests in a module.
+
+    CliRunner keeps no state between invocations; per-invoke env overrides are
+    passed via ``runner.invoke(..., env=...)``.
+    """
     yield CliRunner()
+
+
+@pytest.fixture()
+def no_checkbox(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Fail the test if a command prompts via questionary.checkbox."""
+    monkeypatch.setattr(questionary, "checkbox", _fail_checkbox)
+
+
+@pytest.fixture()
+def link_institutions(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> Callable[..., Path]:
+    """Return a helper that saves fake credentials for institution ids.
+
+    Each ``ins_N`` gets ``item-N``/``access-N`` secrets files, and
+    PLAID_SECRETS_DIR is pointed at the shared secrets dir.
+    """
+
+    secrets_dir = tmp_path / "secrets"
+
+    def _link(*institution_ids: str) -> Path:
+        secrets_dir.mkdir(exist_ok=True)
+        for institution_id in institution_ids:
+            suffix = institution_id.removeprefix("ins_")
+            (secrets_dir / f"{institution_id}_item_id").write_text(f"item-{suffix}")
+            (secrets_dir / f"{institution_id}_access_token").write_text(
+                f"access-{suffix}"
+            )
+        monkeypatch.setenv("PLAID_SECRETS_DIR", str(secrets_dir))
+        return secrets_dir
+
+    return _link
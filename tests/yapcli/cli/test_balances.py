@@ -28,6 +28,7 @@ def test_get_accounts_for_institution_reads_secrets_and_calls_backend(
             access_token: str | None = None,
             item_id: str | None = None,
             env=None,
+            config=None,
         ) -> None:
             captured["access_token"] = access_token
             captured["item_id"] = item_id
@@ -51,10 +52,8 @@ def test_get_accounts_for_institution_reads_secrets_and_calls_backend(
 
 
 def test_balances_without_institution_prompts_and_allows_all_selection(
-    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, runner: CliRunner
 ) -> None:
-    runner = CliRunner()
-
     secrets_dir = tmp_path / "secrets"
     secrets_dir.mkdir()
     (secrets_dir / "ins_1_item_id").write_text("item-1")
@@ -69,6 +68,7 @@ def test_balances_without_institution_prompts_and_allows_all_selection(
             access_token: str | None = None,
             item_id: str | None = None,
             env=None,
+            config=None,
         ) -> None:
             self.access_token = access_token
             self.item_id = item_id
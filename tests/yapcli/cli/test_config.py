@@ -28,10 +28,11 @@ def test_config_paths_prints_loaded_env_files_and_default_dirs(
     result = runner.invoke(cli.app, ["config", "paths"])
 
     assert result.exit_code == 0
-    assert str(env_path) in result.output
-    assert str(secrets_dir) in result.output
-    assert str(logs_dir) in result.output
-    assert str(output_dir) in result.output
+    output = result.stdout
+    assert str(env_path) in output
+    assert str(secrets_dir) in output
+    assert str(logs_dir) in output
+    assert str(output_dir) in output
 
 
 def test_config_set_writes_value_to_env_file(
@@ -160,3 +161,36 @@ def test_config_init_writes_prompted_values(
     assert "PLAID_COUNTRY_CODES=US,CA" in contents
     assert "PLAID_SANDBOX_SECRET=sandbox-secret" in contents
     assert "PLAID_PRODUCTION_SECRET=production-secret" in contents
+
+
+def test_config_init_uses_plain_prompts_when_simple_prompts_enabled(
+    monkeypatch: pytest.MonkeyPatch,
+    runner: CliRunner,
+    tmp_path: Path,
+) -> None:
+    env_path = tmp_path / ".env"
+
+    import yapcli.cli.config as config_cli
+
+    monkeypatch.setattr(config_cli, "default_env_file_path", lambda: env_path)
+    monkeypatch.setenv("YAPCLI_SIMPLE_PROMPTS", "1")
+
+    def fail(*_args, **_kwargs):
+        raise AssertionError("questionary should not be used")
+
+    for name in ("text", "password", "confirm"):
+        monkeypatch.setattr(config_cli.questionary, name, fail)
+
+    result = runner.invoke(
+        cli.app,
+        ["config", "init"],
+        input="client-id\nsandbox\nUS,CA\nsandbox-secret\nproduction-secret\n",
+    )
+
+    assert result.exit_code == 0
+    contents = env_path.read_text()
+    assert "PLAID_CLIENT_ID=client-id" in contents
+    assert "PLAID_ENV=sandbox" in contents
+    assert "PLAID_COUNTRY_CODES=US,CA" in contents
+    assert "PLAID_SANDBOX_SECRET=sandbox-secret" in contents
+    assert "PLAID_PRODUCTION_SECRET=production-secret" in contents
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import datetime as dt
+import os
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from yapcli.cli.fetch import cached_payload, fetch_per_institution
+
+
+def test_fetch_per_institution_fetches_each_institution_once() -> None:
+    calls: List[str] = []
+
+    def fetch(institution_id: str) -> Dict[str, Any]:
+        calls.append(institution_id)
+        if institution_id == "ins_2":
+            raise FileNotFoundError("Missing item_id file")
+        return {"institution": institution_id}
+
+    payloads = fetch_per_institution(fetch, ["ins_1", "ins_2", "ins_1", "ins_3"])
+
+    assert list(payloads) == ["ins_1", "ins_2", "ins_3"]
+    assert payloads["ins_1"] == {"institution": "ins_1"}
+    assert payloads["ins_2"] == {"error": "Missing item_id file"}
+    assert sorted(calls) == ["ins_1", "ins_2", "ins_3"]
+
+
+def test_cached_payload_reuses_recent_payloads_when_enabled(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("YAPCLI_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("YAPCLI_FETCH_CACHE_TTL_SECONDS", "300")
+    calls: List[str] = []
+
+    def fetch() -> Dict[str, Any]:
+        calls.append("holdings")
+        return {"error": None, "holdings": {"date": dt.date(2026, 1, 2)}}
+
+    first = cached_payload("holdings", key=("item-1",), fetch=fetch)
+    second = cached_payload("holdings", key=("item-1",), fetch=fetch)
+    cached_payload("holdings", key=("item-2",), fetch=fetch)
+
+    assert first["holdings"]["date"] == dt.date(2026, 1, 2)
+    assert second == {"error": None, "holdings": {"date": "2026-01-02"}}
+    assert calls == ["holdings", "holdings"]
+
+
+def test_cached_payload_skips_errors_and_is_off_by_default(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("YAPCLI_CACHE_DIR", str(tmp_path))
+    monkeypatch.delenv("YAPCLI_FETCH_CACHE_TTL_SECONDS", raising=False)
+    calls: List[str] = []
+
+    def fetch() -> Dict[str, Any]:
+        calls.append("holdings")
+        return {"error": {"error_code": "ITEM_LOGIN_REQUIRED"}}
+
+    cached_payload("holdings", key=("item-1",), fetch=fetch)
+    cached_payload("holdings", key=("item-1",), fetch=fetch)
+    monkeypatch.setenv("YAPCLI_FETCH_CACHE_TTL_SECONDS", "300")
+    cached_payload("holdings", key=("item-1",), fetch=fetch)
+    cached_payload("holdings", key=("item-1",), fetch=fetch)
+
+    assert len(calls) == 4
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_cached_payload_deletes_expired_entries(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("YAPCLI_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("YAPCLI_FETCH_CACHE_TTL_SECONDS", "300")
+
+    def fetch() -> Dict[str, Any]:
+        return {"error": None, "holdings": []}
+
+    cached_payload("holdings", key=("item-1", "2026-01-01"), fetch=fetch)
+    (stale,) = tmp_path.iterdir()
+    index = tmp_path / "account_index_0123.json"
+    index.write_text("{}")
+    for path in (stale, index):
+        os.utime(path, (0, 0))
+
+    cached_payload("holdings", key=("item-1", "2026-01-02"), fetch=fetch)
+
+    assert not stale.exists()
+    assert index.exists()
+    assert len(list(tmp_path.glob("holdings_*.json"))) == 1
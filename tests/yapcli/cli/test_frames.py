@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from yapcli.accounts import DiscoveredAccount
+from yapcli.cli.frames import flatten_record, write_csv, write_records_csv
+
+
+def test_flatten_record_dot_joins_nested_dicts() -> None:
+    record = {
+        "account_id": "acct-1",
+        "security": {"ticker": "ABC", "meta": {"cusip": "123"}},
+        "tags": ["a", "b"],
+        "empty": {},
+    }
+
+    assert list(flatten_record(record).items()) == [
+        ("account_id", "acct-1"),
+        ("tags", ["a", "b"]),
+        ("security.ticker", "ABC"),
+        ("security.meta.cusip", "123"),
+    ]
+
+
+def test_write_records_csv_unions_columns_and_tags_rows(tmp_path: Path) -> None:
+    account = DiscoveredAccount(
+        institution_id="ins_1",
+        bank_name="Test Bank",
+        account_id="acct-1",
+        type="investment",
+        name="Brokerage",
+        subtype="brokerage",
+        mask="9999",
+    )
+    out_path = tmp_path / "out.csv"
+
+    write_records_csv(
+        [
+            {"account_id": "acct-1", "quantity": 1.5},
+            {"account_id": "acct-1", "security": {"ticker": "ABC"}},
+        ],
+        out_path,
+        institution_id="ins_1",
+        account=account,
+    )
+
+    assert out_path.read_text().splitlines() == [
+        (
+            "institution_id,account_id,quantity,security.ticker,"
+            "account_type,account_name,account_subtype,account_mask,bank_name"
+        ),
+        "ins_1,acct-1,1.5,,investment,Brokerage,brokerage,9999,Test Bank",
+        "ins_1,acct-1,,ABC,investment,Brokerage,brokerage,9999,Test Bank",
+    ]
+
+
+def test_write_records_csv_matches_json_normalize_layout(tmp_path: Path) -> None:
+    # Pinned to what pd.json_normalize(...).to_csv(index=False) produced.
+    out_path = tmp_path / "out.csv"
+
+    write_records_csv(
+        [
+            {
+                "transaction_id": "t-1",
+                "location": {"city": "Austin", "lat": 30.0, "lon": None},
+                "amount": 3.0,
+                "quantity": 3,
+                "pending": False,
+                "personal_finance_category": {"primary": "FOOD"},
+                "merchant_name": "Cafe",
+            },
+            {
+                "transaction_id": "t-2",
+                "location": {"city": None, "lat": None, "lon": -97},
+                "amount": -3,
+                "pending": True,
+            },
+        ],
+        out_path,
+        institution_id="ins_1",
+    )
+
+    assert out_path.read_text().splitlines() == [
+        (
+            "institution_id,transaction_id,amount,quantity,pending,merchant_name,"
+            "location.city,location.lat,location.lon,personal_finance_category.primary"
+        ),
+        "ins_1,t-1,3.0,3.0,False,Cafe,Austin,30.0,,FOOD",
+        "ins_1,t-2,-3.0,,True,,,,-97.0,",
+    ]
+
+
+def test_write_csv_keeps_ints_in_complete_integer_columns(tmp_path: Path) -> None:
+    out_path = tmp_path / "out.csv"
+
+    write_csv(
+        out_path,
+        fieldnames=["count", "flag", "mixed"],
+        rows=[
+            {"count": 1, "flag": True, "mixed": 1},
+            {"count": 2, "flag": None, "mixed": "n/a"},
+        ],
+    )
+
+    assert out_path.read_text().splitlines() == [
+        "count,flag,mixed",
+        "1,True,1",
+        "2,,n/a",
+    ]
@@ -5,17 +5,17 @@ from pathlib import Path
 from typing import Any, Dict
 
 import pytest
-import questionary
 from typer.testing import CliRunner
 
 from yapcli import cli
 
 
 def test_production_flag_overrides_plaid_env(
-    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    no_checkbox: None,
+    runner: CliRunner,
 ) -> None:
-    runner = CliRunner()
-
     # Ensure we're not relying on an external environment.
     monkeypatch.delenv("PLAID_ENV", raising=False)
 
@@ -33,6 +33,7 @@ def test_production_flag_overrides_plaid_env(
             access_token: str | None = None,
             item_id: str | None = None,
             env=None,
+            config=None,
         ) -> None:
             # The whole point: this should be set by the global CLI flag
             seen_env.append(os.environ.get("PLAID_ENV") or "")
@@ -75,11 +76,6 @@ def test_production_flag_overrides_plaid_env(
     monkeypatch.setattr(accounts, "PlaidBackend", FakeBackend)
     monkeypatch.setattr(institutions, "PlaidBackend", FakeBackend)
 
-    def fail_checkbox(*args, **kwargs):
-        raise AssertionError("questionary.checkbox should not be called")
-
-    monkeypatch.setattr(questionary, "checkbox", fail_checkbox)
-
     out_dir = tmp_path / "out"
 
     monkeypatch.setenv("PLAID_SECRETS_DIR", str(secrets_dir))
@@ -100,10 +96,11 @@ def test_production_flag_overrides_plaid_env(
 
 
 def test_sandbox_flag_overrides_existing_plaid_env(
-    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    no_checkbox: None,
+    runner: CliRunner,
 ) -> None:
-    runner = CliRunner()
-
     # Start with production, then force sandbox via flag.
     monkeypatch.setenv("PLAID_ENV", "production")
 
@@ -121,6 +118,7 @@ def test_sandbox_flag_overrides_existing_plaid_env(
             access_token: str | None = None,
             item_id: str | None = None,
             env=None,
+            config=None,
         ) -> None:
             seen_env.append(os.environ.get("PLAID_ENV") or "")
             self.access_token = access_token
@@ -162,11 +160,6 @@ def test_sandbox_flag_overrides_existing_plaid_env(
     monkeypatch.setattr(accounts, "PlaidBackend", FakeBackend)
     monkeypatch.setattr(institutions, "PlaidBackend", FakeBackend)
 
-    def fail_checkbox(*args, **kwargs):
-        raise AssertionError("questionary.checkbox should not be called")
-
-    monkeypatch.setattr(questionary, "checkbox", fail_checkbox)
-
     out_dir = tmp_path / "out"
 
     monkeypatch.setenv("PLAID_SECRETS_DIR", str(secrets_dir))
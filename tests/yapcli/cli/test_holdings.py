@@ -4,17 +4,17 @@ from pathlib import Path
 from typing import Any, Dict
 
 import pytest
-import questionary
 from typer.testing import CliRunner
 
 from yapcli import cli
 
 
 def test_holdings_all_accounts_without_ids_writes_csv(
-    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    no_checkbox: None,
+    runner: CliRunner,
 ) -> None:
-    runner = CliRunner()
-
     secrets_dir = tmp_path / "secrets"
     secrets_dir.mkdir()
     (secrets_dir / "ins_1_item_id").write_text("item-1")
@@ -27,6 +27,7 @@ def test_holdings_all_accounts_without_ids_writes_csv(
             access_token: str | None = None,
             item_id: str | None = None,
             env=None,
+            config=None,
         ) -> None:
             self.access_token = access_token
             self.item_id = item_id
@@ -69,11 +70,6 @@ def test_holdings_all_accounts_without_ids_writes_csv(
     monkeypatch.setattr(accounts, "PlaidBackend", FakeBackend)
     monkeypatch.setattr(institutions, "PlaidBackend", FakeBackend)
 
-    def fail_checkbox(*args, **kwargs):
-        raise AssertionError("questionary.checkbox should not be called")
-
-    monkeypatch.setattr(questionary, "checkbox", fail_checkbox)
-
     out_dir = tmp_path / "out"
 
     monkeypatch.setenv("PLAID_SECRETS_DIR", str(secrets_dir))
@@ -92,3 +88,159 @@ def test_holdings_all_accounts_without_ids_writes_csv(
 
     files = list(out_dir.glob("ins_1_9999_*.csv"))
     assert len(files) == 1
+    assert files[0].read_text().splitlines() == [
+        (
+            "institution_id,account_id,security_id,quantity,"
+            "account_type,account_name,account_subtype,account_mask,bank_name"
+        ),
+        "ins_1,acct-access-1,sec-1,1.0,investment,Brokerage,brokerage,9999,Test Bank",
+    ]
+
+
+def test_holdings_splits_one_institution_payload_across_accounts(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    no_checkbox: None,
+    link_institutions,
+    runner: CliRunner,
+) -> None:
+    link_institutions("ins_1")
+    holdings_calls = []
+
+    class FakeBackend:
+        def __init__(
+            self,
+            *,
+            access_token: str | None = None,
+            item_id: str | None = None,
+            env=None,
+            config=None,
+        ) -> None:
+            pass
+
+        def get_accounts(self) -> Dict[str, Any]:
+            return {
+                "accounts": [
+                    {"account_id": "acct-a", "type": "investment", "mask": "1111"},
+                    {"account_id": "acct-b", "type": "investment", "mask": "2222"},
+                ]
+            }
+
+        def get_holdings(self) -> Dict[str, Any]:
+            holdings_calls.append("get_holdings")
+            return {
+                "error": None,
+                "holdings": {
+                    "holdings": [
+                        {"account_id": "acct-a", "security_id": "sec-1"},
+                        {"account_id": "acct-b", "security_id": "sec-2"},
+                        {"account_id": "acct-a", "security_id": "sec-3"},
+                    ]
+                },
+            }
+
+        def get_item(self) -> Dict[str, Any]:
+            return {"error": None, "item": {}, "institution": {"name": "Test Bank"}}
+
+    import yapcli.cli.holdings as holdings
+    import yapcli.accounts as accounts
+    import yapcli.institutions as institutions
+
+    monkeypatch.setattr(holdings, "PlaidBackend", FakeBackend)
+    monkeypatch.setattr(accounts, "PlaidBackend", FakeBackend)
+    monkeypatch.setattr(institutions, "PlaidBackend", FakeBackend)
+
+    out_dir = tmp_path / "out"
+    result = runner.invoke(
+        cli.app, ["holdings", "ins_1", "--all-accounts", "--out-dir", str(out_dir)]
+    )
+
+    assert result.exit_code == 0
+
+    assert holdings_calls == ["get_holdings"]
+    (file_a,) = out_dir.glob("ins_1_1111_*.csv")
+    (file_b,) = out_dir.glob("ins_1_2222_*.csv")
+    assert [line.split(",")[2] for line in file_a.read_text().splitlines()[1:]] == [
+        "sec-1",
+        "sec-3",
+    ]
+    assert [line.split(",")[2] for line in file_b.read_text().splitlines()[1:]] == [
+        "sec-2"
+    ]
+
+
+def test_holdings_combined_writes_one_csv_per_institution(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    no_checkbox: None,
+    link_institutions,
+    runner: CliRunner,
+) -> None:
+    link_institutions("ins_1")
+
+    class FakeBackend:
+        def __init__(
+            self,
+            *,
+            access_token: str | None = None,
+            item_id: str | None = None,
+            env=None,
+            config=None,
+        ) -> None:
+            pass
+
+        def get_accounts(self) -> Dict[str, Any]:
+            return {
+                "accounts": [
+                    {"account_id": "acct-a", "type": "investment", "mask": "1111"},
+                    {"account_id": "acct-b", "type": "investment", "mask": "2222"},
+                ]
+            }
+
+        def get_holdings(self) -> Dict[str, Any]:
+            return {
+                "error": None,
+                "holdings": {
+                    "holdings": [
+                        {"account_id": "acct-a", "security_id": "sec-1"},
+                        {"account_id": "acct-b", "security_id": "sec-2"},
+                    ]
+                },
+            }
+
+        def get_item(self) -> Dict[str, Any]:
+            return {"error": None, "item": {}, "institution": {"name": "Test Bank"}}
+
+    import yapcli.cli.holdings as holdings
+    import yapcli.accounts as accounts
+    import yapcli.institutions as institutions
+
+    monkeypatch.setattr(holdings, "PlaidBackend", FakeBackend)
+    monkeypatch.setattr(accounts, "PlaidBackend", FakeBackend)
+    monkeypatch.setattr(institutions, "PlaidBackend", FakeBackend)
+
+    out_dir = tmp_path / "out"
+    result = runner.invoke(
+        cli.app,
+        [
+            "holdings",
+            "ins_1",
+            "--all-accounts",
+            "--combined",
+            "--out-dir",
+            str(out_dir),
+        ],
+    )
+
+    assert result.exit_code == 0
+
+    (combined_file,) = out_dir.glob("*.csv")
+    assert combined_file.name.startswith("ins_1_2")
+    assert combined_file.read_text().splitlines() == [
+        (
+            "institution_id,account_id,security_id,"
+            "account_type,account_name,account_subtype,account_mask,bank_name"
+        ),
+        "ins_1,acct-a,sec-1,investment,,,1111,Test Bank",
+        "ins_1,acct-b,sec-2,investment,,,2222,Test Bank",
+    ]
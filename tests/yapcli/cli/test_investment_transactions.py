@@ -13,10 +13,11 @@ from yapcli import cli
 
 
 def test_investment_transactions_account_ids_writes_csv_without_prompt(
-    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    no_checkbox: None,
+    runner: CliRunner,
 ) -> None:
-    runner = CliRunner()
-
     secrets_dir = tmp_path / "secrets"
     secrets_dir.mkdir()
     (secrets_dir / "ins_1_item_id").write_text("item-1")
@@ -29,6 +30,7 @@ def test_investment_transactions_account_ids_writes_csv_without_prompt(
             access_token: str | None = None,
             item_id: str | None = None,
             env=None,
+            config=None,
         ) -> None:
             self.access_token = access_token
             self.item_id = item_id
@@ -72,11 +74,6 @@ def test_investment_transactions_account_ids_writes_csv_without_prompt(
     monkeypatch.setattr(accounts, "PlaidBackend", FakeBackend)
     monkeypatch.setattr(institutions, "PlaidBackend", FakeBackend)
 
-    def fail_checkbox(*args, **kwargs):
-        raise AssertionError("questionary.checkbox should not be called")
-
-    monkeypatch.setattr(questionary, "checkbox", fail_checkbox)
-
     out_dir = tmp_path / "out"
 
     monkeypatch.setenv("PLAID_SECRETS_DIR", str(secrets_dir))
@@ -98,10 +95,8 @@ def test_investment_transactions_account_ids_writes_csv_without_prompt(
 
 
 def test_investment_transactions_prompt_filters_out_credit_accounts(
-    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, runner: CliRunner
 ) -> None:
-    runner = CliRunner()
-
     secrets_dir = tmp_path / "secrets"
     secrets_dir.mkdir()
     (secrets_dir / "ins_1_item_id").write_text("item-1")
@@ -114,6 +109,7 @@ def test_investment_transactions_prompt_filters_out_credit_accounts(
             access_token: str | None = None,
             item_id: str | None = None,
             env=None,
+            config=None,
         ) -> None:
             self.access_token = access_token
             self.item_id = item_id
@@ -197,10 +193,11 @@ def test_investment_transactions_prompt_filters_out_credit_accounts(
 
 
 def test_investment_transactions_start_end_dates_passed_to_backend(
-    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    no_checkbox: None,
+    runner: CliRunner,
 ) -> None:
-    runner = CliRunner()
-
     secrets_dir = tmp_path / "secrets"
     secrets_dir.mkdir()
     (secrets_dir / "ins_1_item_id").write_text("item-1")
@@ -215,6 +212,7 @@ def test_investment_transactions_start_end_dates_passed_to_backend(
             access_token: str | None = None,
             item_id: str | None = None,
             env=None,
+            config=None,
         ) -> None:
             self.access_token = access_token
             self.item_id = item_id
@@ -265,14 +263,6 @@ def test_investment_transactions_start_end_dates_passed_to_backend(
     monkeypatch.setattr(accounts, "PlaidBackend", FakeBackend)
     monkeypatch.setattr(institutions, "PlaidBackend", FakeBackend)
 
-    monkeypatch.setattr(
-        questionary,
-        "checkbox",
-        lambda *_args, **_kwargs: (_ for _ in ()).throw(
-            AssertionError("questionary.checkbox should not be called")
-        ),
-    )
-
     monkeypatch.setenv("PLAID_SECRETS_DIR", str(secrets_dir))
 
     result = runner.invoke(
@@ -295,10 +285,8 @@ def test_investment_transactions_start_end_dates_passed_to_backend(
 
 
 def test_investment_transactions_rejects_start_date_after_end_date(
-    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, runner: CliRunner
 ) -> None:
-    runner = CliRunner()
-
     secrets_dir = tmp_path / "secrets"
     secrets_dir.mkdir()
     (secrets_dir / "ins_1_item_id").write_text("item-1")
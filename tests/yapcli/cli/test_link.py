@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import datetime as dt
+import os
 import subprocess
 import threading
 import time
@@ -34,9 +35,8 @@ def test_build_log_path_uses_timestamp_and_prefix(tmp_path: Path) -> None:
 def test_discover_credentials_returns_latest(tmp_path: Path) -> None:
     secrets_dir = tmp_path / "secrets"
     secrets_dir.mkdir()
-    started_at = time.time()
+    started_at = link.secrets_dir_now(secrets_dir)
 
-    time.sleep(0.05)
     access_path = secrets_dir / "ins_123_access_token"
     item_path = secrets_dir / "ins_123_item_id"
     access_path.write_text("sandbox-access-token")
@@ -47,10 +47,45 @@ def test_discover_credentials_returns_latest(tmp_path: Path) -> None:
     assert credentials == ("ins_123", "sandbox-item-id", "sandbox-access-token")
 
 
+def test_discover_credentials_ignores_tokens_written_before_start(
+    tmp_path: Path,
+) -> None:
+    secrets_dir = tmp_path / "secrets"
+    secrets_dir.mkdir()
+    started_at = link.secrets_dir_now(secrets_dir)
+
+    for suffix in ("access_token", "item_id"):
+        path = secrets_dir / f"ins_stale_{suffix}"
+        path.write_text(f"stale-{suffix}")
+        os.utime(path, (started_at - 0.5, started_at - 0.5))
+
+    assert link.discover_credentials(secrets_dir, started_at) is None
+
+
+def test_discover_credentials_picks_newest_complete_pair(tmp_path: Path) -> None:
+    secrets_dir = tmp_path / "secrets"
+    secrets_dir.mkdir()
+    started_at = time.time()
+
+    for identifier, mtime in (("ins_old", started_at + 1), ("ins_new", started_at + 2)):
+        for suffix in ("access_token", "item_id"):
+            path = secrets_dir / f"{identifier}_{suffix}"
+            path.write_text(f"{identifier}-{suffix}")
+            os.utime(path, (mtime, mtime))
+    orphan = secrets_dir / "ins_orphan_access_token"
+    orphan.write_text("orphan-access-token")
+    os.utime(orphan, (started_at + 3, started_at + 3))
+
+    credentials = link.discover_credentials(secrets_dir, started_at)
+
+    assert credentials == ("ins_new", "ins_new-item_id", "ins_new-access_token")
+
+
 def test_wait_for_credentials_detects_new_files(tmp_path: Path) -> None:
     secrets_dir = tmp_path / "secrets"
     secrets_dir.mkdir()
     started_at = time.time()
+    written_after = link.secrets_dir_now(secrets_dir)
     access_path = secrets_dir / "ins_live_access_token"
     item_path = secrets_dir / "ins_live_item_id"
 
@@ -68,6 +103,7 @@ def test_wait_for_credentials_detects_new_files(tmp_path: Path) -> None:
         timeout=5,
         backend_proc=None,
         frontend_proc=None,
+        written_after=written_after,
     )
 
     writer.join()
@@ -78,6 +114,61 @@ def test_wait_for_credentials_detects_new_files(tmp_path: Path) -> None:
     )
 
 
+def test_wait_for_credentials_defaults_to_the_filesystem_clock(
+    tmp_path: Path,
+) -> None:
+    secrets_dir = tmp_path / "secrets"
+    secrets_dir.mkdir()
+    # A wall-clock start later than the mtimes the filesystem will record.
+    started_at = time.time() + 0.5
+
+    def write_credentials() -> None:
+        time.sleep(0.1)
+        (secrets_dir / "ins_live_access_token").write_text("sandbox-access-token")
+        (secrets_dir / "ins_live_item_id").write_text("sandbox-item-id")
+
+    writer = threading.Thread(target=write_credentials)
+    writer.start()
+
+    identifier, _, _ = link.wait_for_credentials(
+        secrets_dir=secrets_dir,
+        started_at=started_at,
+        timeout=5,
+        backend_proc=None,
+        frontend_proc=None,
+    )
+
+    writer.join()
+    assert identifier == "ins_live"
+
+
+def test_wait_for_credentials_rescans_only_when_secrets_change(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    secrets_dir = tmp_path / "secrets"
+    secrets_dir.mkdir()
+    (secrets_dir / "ins_old_access_token").write_text("old-access-token")
+    scans = []
+    discover = link.discover_credentials
+
+    def counting_discover(secrets_dir: Path, started_at: float):
+        scans.append(started_at)
+        return discover(secrets_dir, started_at)
+
+    monkeypatch.setattr(link, "discover_credentials", counting_discover)
+
+    with pytest.raises(TimeoutError):
+        link.wait_for_credentials(
+            secrets_dir=secrets_dir,
+            started_at=time.time(),
+            timeout=1,
+            backend_proc=None,
+            frontend_proc=None,
+        )
+
+    assert len(scans) == 1
+
+
 def test_wait_for_credentials_times_out(tmp_path: Path) -> None:
     with pytest.raises(TimeoutError):
         link.wait_for_credentials(
@@ -89,6 +180,29 @@ def test_wait_for_credentials_times_out(tmp_path: Path) -> None:
         )
 
 
+def test_wait_for_credentials_fails_fast_when_backend_exits(tmp_path: Path) -> None:
+    log_path = tmp_path / "backend.log"
+    log_handle = log_path.open("w")
+    process = subprocess.Popen(
+        ["sleep", "0.2"], stdout=log_handle, stderr=subprocess.STDOUT
+    )
+    managed = link.ManagedProcess(process=process, log_handle=log_handle)
+
+    try:
+        with pytest.raises(RuntimeError, match="backend terminated"):
+            link.wait_for_credentials(
+                secrets_dir=tmp_path / "secrets",
+                started_at=time.time(),
+                timeout=30,
+                backend_proc=managed,
+                frontend_proc=None,
+            )
+    finally:
+        if process.poll() is None:
+            process.kill()
+        log_handle.close()
+
+
 def test_terminate_process_stops_running_process(tmp_path: Path) -> None:
     log_path = tmp_path / "process.log"
     log_handle = log_path.open("w")
@@ -156,8 +270,9 @@ def test_start_backend_passes_products_arg(
         managed.log_handle.close()
 
 
-def test_link_defaults_to_sandbox_secrets_dir(monkeypatch: pytest.MonkeyPatch) -> None:
-    runner = CliRunner()
+def test_link_defaults_to_sandbox_secrets_dir(
+    monkeypatch: pytest.MonkeyPatch, runner: CliRunner
+) -> None:
     seen: dict[str, Path] = {}
     seen_days: dict[str, int] = {}
 
@@ -203,8 +318,9 @@ def test_link_defaults_to_sandbox_secrets_dir(monkeypatch: pytest.MonkeyPatch) -
     assert seen_days["value"] == 365
 
 
-def test_link_passes_custom_days_requested(monkeypatch: pytest.MonkeyPatch) -> None:
-    runner = CliRunner()
+def test_link_passes_custom_days_requested(
+    monkeypatch: pytest.MonkeyPatch, runner: CliRunner
+) -> None:
     seen_days: dict[str, int] = {}
 
     def fake_start_backend(
@@ -245,9 +361,9 @@ def test_link_passes_custom_days_requested(monkeypatch: pytest.MonkeyPatch) -> N
     assert seen_days["value"] == 120
 
 
-def test_link_rejects_invalid_products(monkeypatch: pytest.MonkeyPatch) -> None:
-    runner = CliRunner()
-
+def test_link_rejects_invalid_products(
+    monkeypatch: pytest.MonkeyPatch, runner: CliRunner
+) -> None:
     # Ensure we fail before trying to start subprocesses.
     monkeypatch.setattr(link, "start_backend", lambda *args, **kwargs: None)
     monkeypatch.setattr(link, "start_frontend", lambda *args, **kwargs: None)
@@ -273,9 +389,14 @@ def test_link_rejects_invalid_products(monkeypatch: pytest.MonkeyPatch) -> None:
     assert "Invalid --products" in result.output
 
 
-def test_link_clear_all_clears_only_current_environment(tmp_path: Path) -> None:
-    runner = CliRunner()
-    env = {"YAPCLI_DEFAULT_DIRS": "CWD", "PLAID_ENV": "production"}
+def test_link_clear_all_clears_only_current_environment(
+    tmp_path: Path, runner: CliRunner
+) -> None:
+    env = {
+        "YAPCLI_DEFAULT_DIRS": "CWD",
+        "PLAID_ENV": "production",
+        "YAPCLI_CACHE_DIR": None,
+    }
 
     with runner.isolated_filesystem(temp_dir=str(tmp_path)):
         cwd = Path.cwd()
@@ -285,16 +406,29 @@ def test_link_clear_all_clears_only_current_environment(tmp_path: Path) -> None:
         (cwd / "sandbox" / "secrets" / "ins_sandbox_access_token").write_text(
             "sandbox-token"
         )
+        (cwd / "cache").mkdir()
+        (cwd / "cache" / "holdings_prod.json").write_text("{}")
+        (cwd / "cache" / "account_index_prod.json").write_text("{}")
+        (cwd / "cache" / "notes.txt").write_text("not ours")
+        (cwd / "cache" / "holdings_notes.txt").write_text("not ours either")
+        (cwd / "sandbox" / "cache").mkdir()
+        (cwd / "sandbox" / "cache" / "holdings_sandbox.json").write_text("{}")
 
         result = runner.invoke(root_cli.app, ["link", "--clear-all"], env=env)
 
         assert result.exit_code == 0
         assert not (cwd / "secrets" / "ins_prod_access_token").exists()
         assert (cwd / "sandbox" / "secrets" / "ins_sandbox_access_token").exists()
+        assert not (cwd / "cache" / "holdings_prod.json").exists()
+        assert not (cwd / "cache" / "account_index_prod.json").exists()
+        assert (cwd / "cache" / "notes.txt").read_text() == "not ours"
+        assert (cwd / "cache" / "holdings_notes.txt").exists()
+        assert (cwd / "sandbox" / "cache" / "holdings_sandbox.json").exists()
 
 
-def test_link_clear_single_institution_by_argument(tmp_path: Path) -> None:
-    runner = CliRunner()
+def test_link_clear_single_institution_by_argument(
+    tmp_path: Path, runner: CliRunner
+) -> None:
     env = {"YAPCLI_DEFAULT_DIRS": "CWD", "PLAID_ENV": "production"}
 
     with runner.isolated_filesystem(temp_dir=str(tmp_path)):
@@ -318,9 +452,8 @@ def test_link_clear_single_institution_by_argument(tmp_path: Path) -> None:
 
 
 def test_link_clear_interactive_uses_questionary_and_item_id(
-    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, runner: CliRunner
 ) -> None:
-    runner = CliRunner()
     env = {"YAPCLI_DEFAULT_DIRS": "CWD", "PLAID_ENV": "production"}
 
     class _AskResult:
@@ -335,7 +468,7 @@ def test_link_clear_interactive_uses_questionary_and_item_id(
         return _AskResult()
 
     class _FakeBackend:
-        def __init__(self, access_token: str, item_id: str):
+        def __init__(self, access_token: str, item_id: str, config=None):
             self.access_token = access_token
             self.item_id = item_id
 
@@ -360,9 +493,7 @@ def test_link_clear_interactive_uses_questionary_and_item_id(
         assert not (secrets / "ins_0000_item_id").exists()
 
 
-def test_link_clear_rejects_multiple_clear_modes() -> None:
-    runner = CliRunner()
-
+def test_link_clear_rejects_multiple_clear_modes(runner: CliRunner) -> None:
     result = runner.invoke(
         root_cli.app,
         ["link", "--clear", "--clear_ins", "ins_0000"],
@@ -372,9 +503,9 @@ def test_link_clear_rejects_multiple_clear_modes() -> None:
     assert "Use only one of --clear, --clear_ins, or --clear-all" in result.output
 
 
-def test_link_clear_rejects_link_options(monkeypatch: pytest.MonkeyPatch) -> None:
-    runner = CliRunner()
-
+def test_link_clear_rejects_link_options(
+    monkeypatch: pytest.MonkeyPatch, runner: CliRunner
+) -> None:
     monkeypatch.setattr(link, "start_backend", lambda *args, **kwargs: None)
 
     result = runner.invoke(
@@ -9,11 +9,8 @@ from yapcli.institutions import DiscoveredInstitution
 
 
 def test_list_shows_institutions_and_accounts(
-    monkeypatch,
-    tmp_path: Path,
+    monkeypatch, tmp_path: Path, runner: CliRunner
 ) -> None:
-    runner = CliRunner()
-
     import yapcli.cli.listing as listing
 
     monkeypatch.setenv("PLAID_SECRETS_DIR", str(tmp_path / "secrets"))
@@ -52,15 +49,16 @@ def test_list_shows_institutions_and_accounts(
     result = runner.invoke(cli.app, ["list"])
 
     assert result.exit_code == 0
-    assert "ins_1 (Bank A)" in result.output
-    assert "Checking (depository/checking) account_id=acc-1 ••••1234" in result.output
-    assert "ins_2" in result.output
-    assert "Brokerage Account (investment/brokerage) account_id=acc-2" in result.output
-
+    output = result.stdout
+    assert "ins_1 (Bank A)" in output
+    assert "Checking (depository/checking) account_id=acc-1 ••••1234" in output
+    assert "ins_2" in output
+    assert "Brokerage Account (investment/brokerage) account_id=acc-2" in output
 
-def test_list_handles_account_fetch_errors(monkeypatch, tmp_path: Path) -> None:
-    runner = CliRunner()
 
+def test_list_handles_account_fetch_errors(
+    monkeypatch, tmp_path: Path, runner: CliRunner
+) -> None:
     import yapcli.cli.listing as listing
 
     monkeypatch.setenv("PLAID_SECRETS_DIR", str(tmp_path / "secrets"))
@@ -79,5 +77,6 @@ def test_list_handles_account_fetch_errors(monkeypatch, tmp_path: Path) -> None:
     result = runner.invoke(cli.app, ["list"])
 
     assert result.exit_code == 0
-    assert "ins_1" in result.output
-    assert "(unable to load accounts)" in result.output
+    output = result.stdout
+    assert "ins_1" in output
+    assert "(unable to load accounts)" in output
@@ -7,8 +7,9 @@ def test_help_shows_when_no_args(runner: CliRunner) -> None:
     result = runner.invoke(cli.app, [])
 
     assert result.exit_code == 2
-    assert "Utilities for interacting with Plaid programmatically." in result.output
-    assert "link" in result.output
+    output = result.stdout
+    assert "Utilities for interacting with Plaid programmatically." in output
+    assert "link" in output
 
 
 def test_version_flag_outputs_version(runner: CliRunner) -> None:
@@ -16,4 +17,4 @@ def test_version_flag_outputs_version(runner: CliRunner) -> None:
     result = runner.invoke(cli.app, ["--version"])
 
     assert result.exit_code == 0
-    assert "yapcli v" in result.output
+    assert "yapcli v" in result.stdout
@@ -1,144 +1,97 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Callable, Dict
 import json
 
 import pytest
 import questionary
 from typer.testing import CliRunner
 
+import yapcli.accounts as accounts
+import yapcli.cli.transactions as transactions
+import yapcli.institutions as institutions
 from yapcli import cli
-
-
-def test_transactions_without_institution_prompts_and_writes_csv(
-    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+from yapcli.accounts import DiscoveredAccount
+
+_CURSOR = ("A" * 91) + "="
+_CHECKING_ACCOUNT: Dict[str, Any] = {
+    "type": "depository",
+    "name": "Checking",
+    "subtype": "checking",
+    "mask": "0000",
+}
+
+
+class _FakeBackend:
+    """PlaidBackend stand-in; tests subclass it to stub get_transactions."""
+
+    __slots__ = ("access_token", "item_id")
+
+    def __init__(
+        self,
+        *,
+        access_token: str | None = None,
+        item_id: str | None = None,
+        env=None,
+        config=None,
+    ) -> None:
+        self.access_token = access_token
+        self.item_id = item_id
+
+    def get_accounts(self) -> Dict[str, Any]:
+        return {
+            "accounts": [
+                {"account_id": f"acct-{self.access_token}", **_CHECKING_ACCOUNT}
+            ]
+        }
+
+    def get_item(self) -> Dict[str, Any]:
+        return {"error": None, "item": {}, "institution": {"name": "Test Bank"}}
+
+
+@pytest.mark.parametrize(
+    ("ids", "all_accounts", "checkbox_return"),
+    [
+        pytest.param(
+            None,
+            False,
+            ["ins_1|acct-access-1", "ins_2|acct-access-2"],
+            id="no-ids-prompts",
+        ),
+        pytest.param(
+            ["acct-access-1", "acct-access-2"],
+            False,
+            None,
+            id="account-ids-skip-prompt",
+        ),
+        pytest.param(
+            ["ins_1", "ins_2"],
+            True,
+            None,
+            id="institution-ids-all-accounts-skip-prompt",
+        ),
+        pytest.param(
+            None,
+            True,
+            None,
+            id="all-accounts-without-ids",
+        ),
+    ],
+)
+def test_transactions_writes_csv_per_account(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    ids: list[str] | None,
+    all_accounts: bool,
+    checkbox_return: list[str] | None,
+    no_checkbox: None,
+    link_institutions: Callable[..., Path],
 ) -> None:
-    runner = CliRunner()
-
-    secrets_dir = tmp_path / "secrets"
-    secrets_dir.mkdir()
-    (secrets_dir / "ins_1_item_id").write_text("item-1")
-    (secrets_dir / "ins_1_access_token").write_text("access-1")
-    (secrets_dir / "ins_2_item_id").write_text("item-2")
-    (secrets_dir / "ins_2_access_token").write_text("access-2")
-
-    class FakeBackend:
-        def __init__(
-            self,
-            *,
-            access_token: str | None = None,
-            item_id: str | None = None,
-            env=None,
-        ) -> None:
-            self.access_token = access_token
-            self.item_id = item_id
-
-        def get_accounts(self) -> Dict[str, Any]:
-            return {
-                "accounts": [
-                    {
-                        "account_id": f"acct-{self.access_token}",
-                        "type": "depository",
-                        "name": "Checking",
-                        "subtype": "checking",
-                        "mask": "0000",
-                    }
-                ]
-            }
-
-        def get_transactions(self, *, account_id: str | None = None) -> Dict[str, Any]:
-            return {
-                "transactions": [
-                    {
-                        "transaction_id": f"txn-{self.access_token}",
-                        "account_id": account_id,
-                        "amount": 12.34,
-                        "date": "2026-02-15",
-                    }
-                ],
-                "cursor": ("A" * 91) + "=",
-            }
-
-        def get_item(self) -> Dict[str, Any]:
-            return {"error": None, "item": {}, "institution": {"name": "Test Bank"}}
-
-    import yapcli.cli.transactions as transactions
-    import yapcli.accounts as accounts
-    import yapcli.institutions as institutions
-
-    monkeypatch.setattr(transactions, "PlaidBackend", FakeBackend)
-    monkeypatch.setattr(accounts, "PlaidBackend", FakeBackend)
-    monkeypatch.setattr(institutions, "PlaidBackend", FakeBackend)
-
-    class FakeCheckbox:
-        def ask(self):
-            return ["ins_1|acct-access-1", "ins_2|acct-access-2"]
-
-    def fake_checkbox(*args, **kwargs):
-        return FakeCheckbox()
-
-    monkeypatch.setattr(questionary, "checkbox", fake_checkbox)
-
-    out_dir = tmp_path / "out"
-
-    monkeypatch.setenv("PLAID_SECRETS_DIR", str(secrets_dir))
-
-    result = runner.invoke(
-        cli.app,
-        [
-            "transactions",
-            "--out-dir",
-            str(out_dir),
-        ],
-    )
+    link_institutions("ins_1", "ins_2")
 
-    assert result.exit_code == 0
-
-    csv_files = list(out_dir.rglob("*.csv"))
-    assert len(csv_files) == 2
-    assert sum("ins_1" in str(p) for p in csv_files) == 1
-    assert sum("ins_2" in str(p) for p in csv_files) == 1
-
-    meta_files = list(out_dir.rglob("*_meta.json"))
-    assert len(meta_files) == 2
-
-
-def test_transactions_with_account_ids_writes_csv_without_prompt(
-    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
-) -> None:
-    runner = CliRunner()
-
-    secrets_dir = tmp_path / "secrets"
-    secrets_dir.mkdir()
-    (secrets_dir / "ins_1_item_id").write_text("item-1")
-    (secrets_dir / "ins_1_access_token").write_text("access-1")
-    (secrets_dir / "ins_2_item_id").write_text("item-2")
-    (secrets_dir / "ins_2_access_token").write_text("access-2")
-
-    class FakeBackend:
-        def __init__(
-            self,
-            *,
-            access_token: str | None = None,
-            item_id: str | None = None,
-            env=None,
-        ) -> None:
-            self.access_token = access_token
-            self.item_id = item_id
-
-        def get_accounts(self) -> Dict[str, Any]:
-            return {
-                "accounts": [
-                    {
-                        "account_id": f"acct-{self.access_token}",
-                        "type": "depository",
-                        "name": "Checking",
-                        "subtype": "checking",
-                        "mask": "0000",
-                    }
-                ]
-            }
+    class FakeBackend(_FakeBackend):
+        __slots__ = ()
 
         def get_transactions(self, *, account_id: str | None = None) -> Dict[str, Any]:
             return {
@@ -150,134 +103,34 @@ def test_transactions_with_account_ids_writes_csv_without_prompt(
                         "date": "2026-02-15",
                     }
                 ],
-                "cursor": ("A" * 91) + "=",
+                "cursor": _CURSOR,
             }
 
-        def get_item(self) -> Dict[str, Any]:
-            return {"error": None, "item": {}, "institution": {"name": "Test Bank"}}
-
-    import yapcli.cli.transactions as transactions
-    import yapcli.accounts as accounts
-    import yapcli.institutions as institutions
-
     monkeypatch.setattr(transactions, "PlaidBackend", FakeBackend)
     monkeypatch.setattr(accounts, "PlaidBackend", FakeBackend)
     monkeypatch.setattr(institutions, "PlaidBackend", FakeBackend)
 
-    def fail_checkbox(*args, **kwargs):
-        raise AssertionError("questionary.checkbox should not be called")
+    if checkbox_return is not None:
 
-    monkeypatch.setattr(questionary, "checkbox", fail_checkbox)
+        class FakeCheckbox:
+            def ask(self):
+                return checkbox_return
 
-    out_dir = tmp_path / "out"
+        def fake_checkbox(*args, **kwargs):
+            return FakeCheckbox()
 
-    monkeypatch.setenv("PLAID_SECRETS_DIR", str(secrets_dir))
-
-    result = runner.invoke(
-        cli.app,
-        [
-            "transactions",
-            "acct-access-1",
-            "acct-access-2",
-            "--out-dir",
-            str(out_dir),
-        ],
-    )
-
-    assert result.exit_code == 0
-
-    csv_files = list(out_dir.rglob("*.csv"))
-    assert len(csv_files) == 2
-    assert sum("ins_1" in str(p) for p in csv_files) == 1
-    assert sum("ins_2" in str(p) for p in csv_files) == 1
-
-    meta_files = list(out_dir.rglob("*_meta.json"))
-    assert len(meta_files) == 2
-
-
-def test_transactions_with_institution_ids_all_accounts_skips_prompt(
-    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
-) -> None:
-    runner = CliRunner()
-
-    secrets_dir = tmp_path / "secrets"
-    secrets_dir.mkdir()
-    (secrets_dir / "ins_1_item_id").write_text("item-1")
-    (secrets_dir / "ins_1_access_token").write_text("access-1")
-    (secrets_dir / "ins_2_item_id").write_text("item-2")
-    (secrets_dir / "ins_2_access_token").write_text("access-2")
-
-    class FakeBackend:
-        def __init__(
-            self,
-            *,
-            access_token: str | None = None,
-            item_id: str | None = None,
-            env=None,
-        ) -> None:
-            self.access_token = access_token
-            self.item_id = item_id
-
-        def get_accounts(self) -> Dict[str, Any]:
-            return {
-                "accounts": [
-                    {
-                        "account_id": f"acct-{self.access_token}",
-                        "type": "depository",
-                        "name": "Checking",
-                        "subtype": "checking",
-                        "mask": "0000",
-                    }
-                ]
-            }
-
-        def get_transactions(self, *, account_id: str | None = None) -> Dict[str, Any]:
-            return {
-                "transactions": [
-                    {
-                        "transaction_id": f"txn-{self.access_token}",
-                        "account_id": account_id,
-                        "amount": 12.34,
-                        "date": "2026-02-15",
-                    }
-                ],
-                "cursor": ("A" * 91) + "=",
-            }
-
-        def get_item(self) -> Dict[str, Any]:
-            return {"error": None, "item": {}, "institution": {"name": "Test Bank"}}
-
-    import yapcli.cli.transactions as transactions
-    import yapcli.accounts as accounts
-    import yapcli.institutions as institutions
-
-    monkeypatch.setattr(transactions, "PlaidBackend", FakeBackend)
-    monkeypatch.setattr(accounts, "PlaidBackend", FakeBackend)
-    monkeypatch.setattr(institutions, "PlaidBackend", FakeBackend)
-
-    def fail_checkbox(*args, **kwargs):
-        raise AssertionError("questionary.checkbox should not be called")
-
-    monkeypatch.setattr(questionary, "checkbox", fail_checkbox)
+        monkeypatch.setattr(questionary, "checkbox", fake_checkbox)
 
     out_dir = tmp_path / "out"
 
-    monkeypatch.setenv("PLAID_SECRETS_DIR", str(secrets_dir))
-
-    result = runner.invoke(
-        cli.app,
-        [
-            "transactions",
-            "ins_1",
-            "ins_2",
-            "--all-accounts",
-            "--out-dir",
-            str(out_dir),
-        ],
+    transactions.get_transactions(
+        ids=ids,
+        all_accounts=all_accounts,
+        out_dir=out_dir,
+        cursor=None,
+        sync=False,
     )
 
-    assert result.exit_code == 0
-
     csv_files = list(out_dir.rglob("*.csv"))
     assert len(csv_files) == 2
     assert sum("ins_1" in str(p) for p in csv_files) == 1
@@ -288,38 +141,16 @@ def test_transactions_with_institution_ids_all_accounts_skips_prompt(
 
 
 def test_transactions_warns_when_backend_returns_error(
-    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    no_checkbox: None,
+    link_institutions: Callable[..., Path],
+    runner: CliRunner,
 ) -> None:
-    runner = CliRunner()
-
-    secrets_dir = tmp_path / "secrets"
-    secrets_dir.mkdir()
-    (secrets_dir / "ins_1_item_id").write_text("item-1")
-    (secrets_dir / "ins_1_access_token").write_text("access-1")
-
-    class FakeBackend:
-        def __init__(
-            self,
-            *,
-            access_token: str | None = None,
-            item_id: str | None = None,
-            env=None,
-        ) -> None:
-            self.access_token = access_token
-            self.item_id = item_id
-
-        def get_accounts(self) -> Dict[str, Any]:
-            return {
-                "accounts": [
-                    {
-                        "account_id": f"acct-{self.access_token}",
-                        "type": "depository",
-                        "name": "Checking",
-                        "subtype": "checking",
-                        "mask": "0000",
-                    }
-                ]
-            }
+    link_institutions("ins_1")
+
+    class FakeBackend(_FakeBackend):
+        __slots__ = ()
 
         def get_transactions(self, *, account_id: str | None = None) -> Dict[str, Any]:
             return {
@@ -335,26 +166,12 @@ def test_transactions_warns_when_backend_returns_error(
                 "cursor": "",
             }
 
-        def get_item(self) -> Dict[str, Any]:
-            return {"error": None, "item": {}, "institution": {"name": "Test Bank"}}
-
-    import yapcli.cli.transactions as transactions
-    import yapcli.accounts as accounts
-    import yapcli.institutions as institutions
-
     monkeypatch.setattr(transactions, "PlaidBackend", FakeBackend)
     monkeypatch.setattr(accounts, "PlaidBackend", FakeBackend)
     monkeypatch.setattr(institutions, "PlaidBackend", FakeBackend)
 
-    def fail_checkbox(*args, **kwargs):
-        raise AssertionError("questionary.checkbox should not be called")
-
-    monkeypatch.setattr(questionary, "checkbox", fail_checkbox)
-
     out_dir = tmp_path / "out"
 
-    monkeypatch.setenv("PLAID_SECRETS_DIR", str(secrets_dir))
-
     result = runner.invoke(
         cli.app,
         [
@@ -366,133 +183,22 @@ def test_transactions_warns_when_backend_returns_error(
     )
 
     assert result.exit_code == 0
-    assert "WARNING:" in result.output
-    assert "EMPTY_NEXT_CURSOR" in result.output
-
-
-def test_transactions_all_accounts_without_ids_processes_everything(
-    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
-) -> None:
-    runner = CliRunner()
-
-    secrets_dir = tmp_path / "secrets"
-    secrets_dir.mkdir()
-    (secrets_dir / "ins_1_item_id").write_text("item-1")
-    (secrets_dir / "ins_1_access_token").write_text("access-1")
-    (secrets_dir / "ins_2_item_id").write_text("item-2")
-    (secrets_dir / "ins_2_access_token").write_text("access-2")
-
-    class FakeBackend:
-        def __init__(
-            self,
-            *,
-            access_token: str | None = None,
-            item_id: str | None = None,
-            env=None,
-        ) -> None:
-            self.access_token = access_token
-            self.item_id = item_id
-
-        def get_accounts(self) -> Dict[str, Any]:
-            return {
-                "accounts": [
-                    {
-                        "account_id": f"acct-{self.access_token}",
-                        "type": "depository",
-                        "name": "Checking",
-                        "subtype": "checking",
-                        "mask": "0000",
-                    }
-                ]
-            }
-
-        def get_transactions(self, *, account_id: str | None = None) -> Dict[str, Any]:
-            return {
-                "transactions": [
-                    {
-                        "transaction_id": f"txn-{self.access_token}",
-                        "account_id": account_id,
-                        "amount": 12.34,
-                        "date": "2026-02-15",
-                    }
-                ],
-                "cursor": ("A" * 91) + "=",
-            }
-
-        def get_item(self) -> Dict[str, Any]:
-            return {"error": None, "item": {}, "institution": {"name": "Test Bank"}}
-
-    import yapcli.cli.transactions as transactions
-    import yapcli.accounts as accounts
-    import yapcli.institutions as institutions
-
-    monkeypatch.setattr(transactions, "PlaidBackend", FakeBackend)
-    monkeypatch.setattr(accounts, "PlaidBackend", FakeBackend)
-    monkeypatch.setattr(institutions, "PlaidBackend", FakeBackend)
-
-    def fail_checkbox(*args, **kwargs):
-        raise AssertionError("questionary.checkbox should not be called")
-
-    monkeypatch.setattr(questionary, "checkbox", fail_checkbox)
-
-    out_dir = tmp_path / "out"
-
-    monkeypatch.setenv("PLAID_SECRETS_DIR", str(secrets_dir))
-
-    result = runner.invoke(
-        cli.app,
-        [
-            "transactions",
-            "--all-accounts",
-            "--out-dir",
-            str(out_dir),
-        ],
-    )
-
-    assert result.exit_code == 0
-
-    csv_files = list(out_dir.rglob("*.csv"))
-    assert len(csv_files) == 2
-    assert sum("ins_1" in str(p) for p in csv_files) == 1
-    assert sum("ins_2" in str(p) for p in csv_files) == 1
-
-    meta_files = list(out_dir.rglob("*_meta.json"))
-    assert len(meta_files) == 2
+    output = result.output
+    assert "WARNING:" in output
+    assert "EMPTY_NEXT_CURSOR" in output
 
 
 def test_transactions_warns_and_writes_modified_and_removed_csvs(
-    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    no_checkbox: None,
+    link_institutions: Callable[..., Path],
+    runner: CliRunner,
 ) -> None:
-    runner = CliRunner()
-
-    secrets_dir = tmp_path / "secrets"
-    secrets_dir.mkdir()
-    (secrets_dir / "ins_1_item_id").write_text("item-1")
-    (secrets_dir / "ins_1_access_token").write_text("access-1")
-
-    class FakeBackend:
-        def __init__(
-            self,
-            *,
-            access_token: str | None = None,
-            item_id: str | None = None,
-            env=None,
-        ) -> None:
-            self.access_token = access_token
-            self.item_id = item_id
-
-        def get_accounts(self) -> Dict[str, Any]:
-            return {
-                "accounts": [
-                    {
-                        "account_id": f"acct-{self.access_token}",
-                        "type": "depository",
-                        "name": "Checking",
-                        "subtype": "checking",
-                        "mask": "0000",
-                    }
-                ]
-            }
+    link_institutions("ins_1")
+
+    class FakeBackend(_FakeBackend):
+        __slots__ = ()
 
         def get_transactions(self, *, account_id: str | None = None) -> Dict[str, Any]:
             return {
@@ -519,29 +225,15 @@ def test_transactions_warns_and_writes_modified_and_removed_csvs(
                         "date": "2026-02-14",
                     }
                 ],
-                "cursor": ("A" * 91) + "=",
+                "cursor": _CURSOR,
             }
 
-        def get_item(self) -> Dict[str, Any]:
-            return {"error": None, "item": {}, "institution": {"name": "Test Bank"}}
-
-    import yapcli.cli.transactions as transactions
-    import yapcli.accounts as accounts
-    import yapcli.institutions as institutions
-
     monkeypatch.setattr(transactions, "PlaidBackend", FakeBackend)
     monkeypatch.setattr(accounts, "PlaidBackend", FakeBackend)
     monkeypatch.setattr(institutions, "PlaidBackend", FakeBackend)
 
-    def fail_checkbox(*args, **kwargs):
-        raise AssertionError("questionary.checkbox should not be called")
-
-    monkeypatch.setattr(questionary, "checkbox", fail_checkbox)
-
     out_dir = tmp_path / "out"
 
-    monkeypatch.setenv("PLAID_SECRETS_DIR", str(secrets_dir))
-
     result = runner.invoke(
         cli.app,
         [
@@ -555,26 +247,27 @@ def test_transactions_warns_and_writes_modified_and_removed_csvs(
     assert result.exit_code == 0
     assert "WARNING: Plaid sync returned modified=1 removed=1" in result.stdout
 
-    csv_files = sorted(str(p) for p in out_dir.rglob("*.csv"))
-    assert len(csv_files) == 3
-    assert any(p.endswith("_modified.csv") for p in csv_files)
-    assert any(p.endswith("_removed.csv") for p in csv_files)
+    csv_count = 0
+    has_modified = has_removed = False
+    for path in out_dir.rglob("*.csv"):
+        csv_count += 1
+        has_modified |= path.name.endswith("_modified.csv")
+        has_removed |= path.name.endswith("_removed.csv")
+    assert csv_count == 3
+    assert has_modified
+    assert has_removed
 
-    meta_files = sorted(str(p) for p in out_dir.rglob("*_meta.json"))
+    meta_files = list(out_dir.rglob("*_meta.json"))
     assert len(meta_files) == 1
 
 
 def test_transactions_cursor_option_only_allowed_for_single_account_id(
-    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    link_institutions: Callable[..., Path],
+    runner: CliRunner,
 ) -> None:
-    runner = CliRunner()
-
-    secrets_dir = tmp_path / "secrets"
-    secrets_dir.mkdir()
-    (secrets_dir / "ins_1_item_id").write_text("item-1")
-    (secrets_dir / "ins_1_access_token").write_text("access-1")
-
-    monkeypatch.setenv("PLAID_SECRETS_DIR", str(secrets_dir))
+    link_institutions("ins_1")
 
     result = runner.invoke(
         cli.app,
@@ -594,43 +287,18 @@ def test_transactions_cursor_option_only_allowed_for_single_account_id(
 
 
 def test_transactions_cursor_option_passes_cursor_to_backend_and_filename(
-    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    no_checkbox: None,
+    link_institutions: Callable[..., Path],
 ) -> None:
-    runner = CliRunner()
-
-    secrets_dir = tmp_path / "secrets"
-    secrets_dir.mkdir()
-    (secrets_dir / "ins_1_item_id").write_text("item-1")
-    (secrets_dir / "ins_1_access_token").write_text("access-1")
-
-    monkeypatch.setenv("PLAID_SECRETS_DIR", str(secrets_dir))
+    link_institutions("ins_1")
 
     seen: dict[str, str | None] = {"cursor": None}
     requested_cursor = ("B" * 91) + "="
 
-    class FakeBackend:
-        def __init__(
-            self,
-            *,
-            access_token: str | None = None,
-            item_id: str | None = None,
-            env=None,
-        ) -> None:
-            self.access_token = access_token
-            self.item_id = item_id
-
-        def get_accounts(self) -> Dict[str, Any]:
-            return {
-                "accounts": [
-                    {
-                        "account_id": f"acct-{self.access_token}",
-                        "type": "depository",
-                        "name": "Checking",
-                        "subtype": "checking",
-                        "mask": "0000",
-                    }
-                ]
-            }
+    class FakeBackend(_FakeBackend):
+        __slots__ = ()
 
         def get_transactions(
             self, *, account_id: str | None = None, cursor: str | None = None
@@ -645,42 +313,23 @@ def test_transactions_cursor_option_passes_cursor_to_backend_and_filename(
                         "date": "2026-02-15",
                     }
                 ],
-                "cursor": cursor or ("A" * 91) + "=",
+                "cursor": cursor or _CURSOR,
             }
 
-        def get_item(self) -> Dict[str, Any]:
-            return {"error": None, "item": {}, "institution": {"name": "Test Bank"}}
-
-    import yapcli.cli.transactions as transactions
-    import yapcli.accounts as accounts
-    import yapcli.institutions as institutions
-
     monkeypatch.setattr(transactions, "PlaidBackend", FakeBackend)
     monkeypatch.setattr(accounts, "PlaidBackend", FakeBackend)
     monkeypatch.setattr(institutions, "PlaidBackend", FakeBackend)
 
-    def fail_checkbox(*args, **kwargs):
-        raise AssertionError("questionary.checkbox should not be called")
-
-    monkeypatch.setattr(questionary, "checkbox", fail_checkbox)
-
     out_dir = tmp_path / "out"
 
-    monkeypatch.setenv("PLAID_SECRETS_DIR", str(secrets_dir))
-
-    result = runner.invoke(
-        cli.app,
-        [
-            "transactions",
-            "acct-access-1",
-            "--cursor",
-            requested_cursor,
-            "--out-dir",
-            str(out_dir),
-        ],
+    transactions.get_transactions(
+        ids=["acct-access-1"],
+        all_accounts=False,
+        out_dir=out_dir,
+        cursor=requested_cursor,
+        sync=False,
     )
 
-    assert result.exit_code == 0
     assert seen["cursor"] == requested_cursor
 
     csv_files = [p for p in out_dir.rglob("*.csv")]
@@ -699,18 +348,15 @@ def test_transactions_cursor_option_passes_cursor_to_backend_and_filename(
 
 
 def test_transactions_sync_uses_latest_meta_cursor(
-    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    no_checkbox: None,
+    link_institutions: Callable[..., Path],
 ) -> None:
-    runner = CliRunner()
-
-    secrets_dir = tmp_path / "secrets"
-    secrets_dir.mkdir()
-    (secrets_dir / "ins_1_item_id").write_text("item-1")
-    (secrets_dir / "ins_1_access_token").write_text("access-1")
+    link_institutions("ins_1")
 
     # Pre-create two meta files (older + newer) for the account.
     out_dir = tmp_path / "out"
-    from yapcli.accounts import DiscoveredAccount
 
     account = DiscoveredAccount(
         institution_id="ins_1",
@@ -722,14 +368,12 @@ def test_transactions_sync_uses_latest_meta_cursor(
         mask="0000",
     )
 
-    import yapcli.cli.transactions as transactions
-
     old_meta = transactions.build_transactions_meta_path(
         out_dir=out_dir, account=account, timestamp="20260215T000000Z"
     )
     old_meta.parent.mkdir(parents=True, exist_ok=True)
     old_meta.write_text(
-        json.dumps({"account_id": account.account_id, "cursor": ("O" * 10)}, indent=2)
+        json.dumps({"account_id": account.account_id, "cursor": ("O" * 10)})
     )
 
     new_cursor = "N" * 10
@@ -737,34 +381,13 @@ def test_transactions_sync_uses_latest_meta_cursor(
         out_dir=out_dir, account=account, timestamp="20260216T000000Z"
     )
     new_meta.write_text(
-        json.dumps({"account_id": account.account_id, "cursor": new_cursor}, indent=2)
+        json.dumps({"account_id": account.account_id, "cursor": new_cursor})
     )
 
     seen: dict[str, str | None] = {"cursor": None}
 
-    class FakeBackend:
-        def __init__(
-            self,
-            *,
-            access_token: str | None = None,
-            item_id: str | None = None,
-            env=None,
-        ) -> None:
-            self.access_token = access_token
-            self.item_id = item_id
-
-        def get_accounts(self) -> Dict[str, Any]:
-            return {
-                "accounts": [
-                    {
-                        "account_id": "acct-access-1",
-                        "type": "depository",
-                        "name": "Checking",
-                        "subtype": "checking",
-                        "mask": "0000",
-                    }
-                ]
-            }
+    class FakeBackend(_FakeBackend):
+        __slots__ = ()
 
         def get_transactions(
             self, *, account_id: str | None = None, cursor: str | None = None
@@ -782,50 +405,31 @@ def test_transactions_sync_uses_latest_meta_cursor(
                 "cursor": cursor or "",
             }
 
-        def get_item(self) -> Dict[str, Any]:
-            return {"error": None, "item": {}, "institution": {"name": "Test Bank"}}
-
-    import yapcli.accounts as accounts
-    import yapcli.institutions as institutions
-
     monkeypatch.setattr(transactions, "PlaidBackend", FakeBackend)
     monkeypatch.setattr(accounts, "PlaidBackend", FakeBackend)
     monkeypatch.setattr(institutions, "PlaidBackend", FakeBackend)
 
-    def fail_checkbox(*args, **kwargs):
-        raise AssertionError("questionary.checkbox should not be called")
-
-    monkeypatch.setattr(questionary, "checkbox", fail_checkbox)
-
-    monkeypatch.setenv("PLAID_SECRETS_DIR", str(secrets_dir))
-
-    result = runner.invoke(
-        cli.app,
-        [
-            "transactions",
-            "acct-access-1",
-            "--sync",
-            "--out-dir",
-            str(out_dir),
-        ],
+    transactions.get_transactions(
+        ids=["acct-access-1"],
+        all_accounts=False,
+        out_dir=out_dir,
+        cursor=None,
+        sync=True,
     )
 
-    assert result.exit_code == 0
     assert seen["cursor"] == new_cursor
 
 
 def test_transactions_sync_errors_on_account_id_mismatch(
-    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    no_checkbox: None,
+    link_institutions: Callable[..., Path],
+    runner: CliRunner,
 ) -> None:
-    runner = CliRunner()
-
-    secrets_dir = tmp_path / "secrets"
-    secrets_dir.mkdir()
-    (secrets_dir / "ins_1_item_id").write_text("item-1")
-    (secrets_dir / "ins_1_access_token").write_text("access-1")
+    link_institutions("ins_1")
 
     out_dir = tmp_path / "out"
-    from yapcli.accounts import DiscoveredAccount
 
     account = DiscoveredAccount(
         institution_id="ins_1",
@@ -837,37 +441,14 @@ def test_transactions_sync_errors_on_account_id_mismatch(
         mask="0000",
     )
 
-    import yapcli.cli.transactions as transactions
-
     meta = transactions.build_transactions_meta_path(
         out_dir=out_dir, account=account, timestamp="20260216T000000Z"
     )
     meta.parent.mkdir(parents=True, exist_ok=True)
-    meta.write_text(json.dumps({"account_id": "different", "cursor": "CUR"}, indent=2))
-
-    class FakeBackend:
-        def __init__(
-            self,
-            *,
-            access_token: str | None = None,
-            item_id: str | None = None,
-            env=None,
-        ) -> None:
-            self.access_token = access_token
-            self.item_id = item_id
-
-        def get_accounts(self) -> Dict[str, Any]:
-            return {
-                "accounts": [
-                    {
-                        "account_id": "acct-access-1",
-                        "type": "depository",
-                        "name": "Checking",
-                        "subtype": "checking",
-                        "mask": "0000",
-                    }
-                ]
-            }
+    meta.write_text(json.dumps({"account_id": "different", "cursor": "CUR"}))
+
+    class FakeBackend(_FakeBackend):
+        __slots__ = ()
 
         def get_transactions(
             self, *, account_id: str | None = None, cursor: str | None = None
@@ -877,23 +458,10 @@ def test_transactions_sync_errors_on_account_id_mismatch(
                 "cursor": cursor or "",
             }
 
-        def get_item(self) -> Dict[str, Any]:
-            return {"error": None, "item": {}, "institution": {"name": "Test Bank"}}
-
-    import yapcli.accounts as accounts
-    import yapcli.institutions as institutions
-
     monkeypatch.setattr(transactions, "PlaidBackend", FakeBackend)
     monkeypatch.setattr(accounts, "PlaidBackend", FakeBackend)
     monkeypatch.setattr(institutions, "PlaidBackend", FakeBackend)
 
-    def fail_checkbox(*args, **kwargs):
-        raise AssertionError("questionary.checkbox should not be called")
-
-    monkeypatch.setattr(questionary, "checkbox", fail_checkbox)
-
-    monkeypatch.setenv("PLAID_SECRETS_DIR", str(secrets_dir))
-
     result = runner.invoke(
         cli.app,
         [
@@ -910,41 +478,18 @@ def test_transactions_sync_errors_on_account_id_mismatch(
 
 
 def test_transactions_sync_with_no_existing_meta_runs_without_cursor(
-    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    no_checkbox: None,
+    link_institutions: Callable[..., Path],
 ) -> None:
-    runner = CliRunner()
-
-    secrets_dir = tmp_path / "secrets"
-    secrets_dir.mkdir()
-    (secrets_dir / "ins_1_item_id").write_text("item-1")
-    (secrets_dir / "ins_1_access_token").write_text("access-1")
+    link_institutions("ins_1")
 
     out_dir = tmp_path / "out"
     seen: dict[str, str | None] = {"cursor": "sentinel"}
 
-    class FakeBackend:
-        def __init__(
-            self,
-            *,
-            access_token: str | None = None,
-            item_id: str | None = None,
-            env=None,
-        ) -> None:
-            self.access_token = access_token
-            self.item_id = item_id
-
-        def get_accounts(self) -> Dict[str, Any]:
-            return {
-                "accounts": [
-                    {
-                        "account_id": "acct-access-1",
-                        "type": "depository",
-                        "name": "Checking",
-                        "subtype": "checking",
-                        "mask": "0000",
-                    }
-                ]
-            }
+    class FakeBackend(_FakeBackend):
+        __slots__ = ()
 
         def get_transactions(
             self, *, account_id: str | None = None, cursor: str | None = None
@@ -955,34 +500,16 @@ def test_transactions_sync_with_no_existing_meta_runs_without_cursor(
                 "cursor": cursor or "",
             }
 
-        def get_item(self) -> Dict[str, Any]:
-            return {"error": None, "item": {}, "institution": {"name": "Test Bank"}}
-
-    import yapcli.cli.transactions as transactions
-    import yapcli.accounts as accounts
-    import yapcli.institutions as institutions
-
     monkeypatch.setattr(transactions, "PlaidBackend", FakeBackend)
     monkeypatch.setattr(accounts, "PlaidBackend", FakeBackend)
     monkeypatch.setattr(institutions, "PlaidBackend", FakeBackend)
 
-    def fail_checkbox(*args, **kwargs):
-        raise AssertionError("questionary.checkbox should not be called")
-
-    monkeypatch.setattr(questionary, "checkbox", fail_checkbox)
-
-    monkeypatch.setenv("PLAID_SECRETS_DIR", str(secrets_dir))
-
-    result = runner.invoke(
-        cli.app,
-        [
-            "transactions",
-            "acct-access-1",
-            "--sync",
-            "--out-dir",
-            str(out_dir),
-        ],
+    transactions.get_transactions(
+        ids=["acct-access-1"],
+        all_accounts=False,
+        out_dir=out_dir,
+        cursor=None,
+        sync=True,
     )
 
-    assert result.exit_code == 0
     assert seen["cursor"] is None
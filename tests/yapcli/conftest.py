@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import os
+import time
+import types
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional
+
+import pytest
+
+# Keep a developer's local .env files out of the test process; must be set
+# before yapcli is first imported.
+os.environ.setdefault("YAPCLI_SKIP_DOTENV", "1")
+# Typer's Rich console reads these once at import: keep it a plain, fixed-width
+# renderer (no forced terminal/colour on CI) so help and error output is cheap
+# to render and stable to assert against.
+# _TYPER_FORCE_DISABLE_TERMINAL is private to Typer: it is read by
+# typer/rich_utils.py (checked against typer 0.20.x), where it overrides the
+# GITHUB_ACTIONS/FORCE_COLOR/PY_COLORS forcing. Recheck on Typer upgrades; if
+# it goes away, CI help output will contain ANSI styling again.
+os.environ.setdefault("_TYPER_FORCE_DISABLE_TERMINAL", "1")
+os.environ.setdefault("TERMINAL_WIDTH", "200")
+
+import yapcli.server
+from yapcli.accounts import clear_discovery_cache
+from yapcli.secrets import clear_credentials_cache
+from yapcli.server import PlaidBackend
+
+
+class FakePlaidResponse:
+    def __init__(self, payload: Mapping[str, Any]) -> None:
+        self._payload = payload
+
+    def to_dict(self) -> Mapping[str, Any]:
+        return self._payload
+
+
+class FakePlaidClient:
+    """Stand-in for ``plaid_api.PlaidApi`` that records requests.
+
+    Endpoints are registered per test with :meth:`respond`; unregistered
+    endpoints raise AttributeError just like a misspelled client method would.
+    """
+
+    def __init__(self) -> None:
+        self.requests: List[Dict[str, Any]] = []
+        self.calls = 0
+
+    def respond(self, method_name: str, *payloads: Mapping[str, Any]) -> None:
+        """Serve ``payloads`` in order from ``method_name``; the last one repeats."""
+
+        pages = list(payloads)
+
+        def endpoint(request: Any, **_kwargs: Any) -> FakePlaidResponse:
+            self.requests.append(request.to_dict())
+            self.calls += 1
+            return FakePlaidResponse(pages[min(self.calls, len(pages)) - 1])
+
+        setattr(self, method_name, endpoint)
+
+
+@pytest.fixture()
+def fake_plaid_client() -> FakePlaidClient:
+    return FakePlaidClient()
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache_dir(
+    monkeypatch: pytest.MonkeyPatch, tmp_path_factory: pytest.TempPathFactory
+) -> None:
+    """Keep the fetch cache and account index out of the real cache dir."""
+    monkeypatch.setenv("YAPCLI_CACHE_DIR", str(tmp_path_factory.mktemp("cache")))
+
+
+@pytest.fixture(autouse=True)
+def _fresh_process_caches() -> Iterator[None]:
+    """Keep cached secrets and discovery results from leaking between tests."""
+    yield
+    clear_credentials_cache()
+    clear_discovery_cache()
+
+
+@pytest.fixture(autouse=True)
+def _no_plaid_retry_sleep(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Skip the Plaid retry/backoff waits in yapcli.server.
+
+    Only yapcli.server sees the no-op sleep: time.sleep itself stays real, so
+    threads elsewhere (e.g. the link tests' secrets writer) still wait.
+    """
+    server_time = types.SimpleNamespace(**vars(time))
+    server_time.sleep = lambda _seconds: None
+    monkeypatch.setattr(yapcli.server, "time", server_time)
+
+
+@pytest.fixture()
+def make_backend() -> Callable[..., PlaidBackend]:
+    """Return a factory for PlaidBackend instances without an item context.
+
+    Each call builds a new backend, so tests can mutate ``client``, ``_env`` or
+    the product lists without affecting each other; construction is cheap now
+    that the Flask app is built lazily.
+    """
+
+    def _make(
+        env: Dict[str, str], *, products: Optional[List[str]] = None
+    ) -> PlaidBackend:
+        return PlaidBackend(env=env, products=products)
+
+    return _make
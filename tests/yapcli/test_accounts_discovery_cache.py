@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+import yapcli.accounts as accounts
+import yapcli.institutions as institutions
+
+
+def test_discovery_is_reused_until_secrets_change(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    secrets_dir = tmp_path / "secrets"
+    secrets_dir.mkdir()
+    (secrets_dir / "ins_1_item_id").write_text("item-1")
+    (secrets_dir / "ins_1_access_token").write_text("access-1")
+
+    calls: List[str] = []
+
+    class FakeBackend:
+        def __init__(
+            self,
+            *,
+            access_token: str | None = None,
+            item_id: str | None = None,
+            env=None,
+            config=None,
+        ) -> None:
+            self.access_token = access_token
+
+        def get_item(self) -> Dict[str, Any]:
+            calls.append("get_item")
+            return {"institution": {"name": "Test Bank"}}
+
+        def get_accounts(self) -> Dict[str, Any]:
+            calls.append("get_accounts")
+            return {"accounts": [{"account_id": f"acct-{self.access_token}"}]}
+
+    monkeypatch.setattr(accounts, "PlaidBackend", FakeBackend)
+    monkeypatch.setattr(institutions, "PlaidBackend", FakeBackend)
+
+    def resolve() -> List[str]:
+        return [
+            account.account_id
+            for account in accounts.resolve_target_accounts(
+                ids=None, secrets_dir=secrets_dir, all_accounts=True
+            )
+        ]
+
+    assert resolve() == ["acct-access-1"]
+    assert resolve() == ["acct-access-1"]
+    assert calls == ["get_item", "get_accounts"]
+
+    (secrets_dir / "ins_2_item_id").write_text("item-2")
+    (secrets_dir / "ins_2_access_token").write_text("access-2")
+
+    assert resolve() == ["acct-access-1", "acct-access-2"]
+    assert calls.count("get_accounts") == 3
+
+
+def test_account_id_lookup_uses_saved_index(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    secrets_dir = tmp_path / "secrets"
+    secrets_dir.mkdir()
+    for n in (1, 2, 3):
+        (secrets_dir / f"ins_{n}_item_id").write_text(f"item-{n}")
+        (secrets_dir / f"ins_{n}_access_token").write_text(f"access-{n}")
+
+    fetched: List[str] = []
+
+    class FakeBackend:
+        def __init__(
+            self,
+            *,
+            access_token: str | None = None,
+            item_id: str | None = None,
+            env=None,
+            config=None,
+        ) -> None:
+            self.access_token = access_token
+
+        def get_item(self) -> Dict[str, Any]:
+            return {"institution": {"name": "Test Bank"}}
+
+        def get_accounts(self) -> Dict[str, Any]:
+            fetched.append(str(self.access_token))
+            return {"accounts": [{"account_id": f"acct-{self.access_token}"}]}
+
+    monkeypatch.setattr(accounts, "PlaidBackend", FakeBackend)
+    monkeypatch.setattr(institutions, "PlaidBackend", FakeBackend)
+
+    def resolve(account_id: str) -> List[str]:
+        return [
+            account.institution_id
+            for account in accounts.resolve_target_accounts(
+                ids=[account_id], secrets_dir=secrets_dir, all_accounts=False
+            )
+        ]
+
+    assert resolve("acct-access-2") == ["ins_2"]
+    assert sorted(fetched) == ["access-1", "access-2", "access-3"]
+    index_path = accounts.account_index_path(secrets_dir)
+    index_inode = index_path.stat().st_ino
+    assert [
+        path.name for path in secrets_dir.iterdir() if path.name.startswith(".")
+    ] == []
+
+    # A fresh process only queries the institution that owns the account.
+    accounts.clear_discovery_cache()
+    fetched.clear()
+    assert resolve("acct-access-2") == ["ins_2"]
+    assert fetched == ["access-2"]
+
+    # Rediscovering the same accounts leaves the saved index file in place.
+    accounts.clear_discovery_cache()
+    accounts.resolve_target_accounts(
+        ids=None, secrets_dir=secrets_dir, all_accounts=True
+    )
+    assert index_path.stat().st_ino == index_inode
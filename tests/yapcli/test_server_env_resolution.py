@@ -2,85 +2,97 @@ from __future__ import annotations
 
 import os
 from pathlib import Path
+from typing import Dict
+
+import pytest
 
 from yapcli.env import load_env_files
-from yapcli.server import _resolve_plaid_env_and_secret
-
-
-def test_defaults_to_production_when_both_env_secrets_defined_and_plaid_env_missing() -> (
-    None
-):
-    env = {
-        "PLAID_CLIENT_ID": "client",
-        "PLAID_SANDBOX_SECRET": "sandbox-secret",
-        "PLAID_PRODUCTION_SECRET": "production-secret",
-        # PLAID_ENV missing
-        # PLAID_SECRET missing
-    }
-
-    plaid_env, plaid_secret = _resolve_plaid_env_and_secret(env)
-    assert plaid_env == "production"
-    assert plaid_secret == "production-secret"
-
-
-def test_uses_env_specific_secret_when_plaid_secret_missing_and_env_is_sandbox() -> (
-    None
-):
-    env = {
-        "PLAID_CLIENT_ID": "client",
-        "PLAID_ENV": "sandbox",
-        "PLAID_SANDBOX_SECRET": "sandbox-secret",
-        # PLAID_SECRET missing
-    }
-
-    plaid_env, plaid_secret = _resolve_plaid_env_and_secret(env)
-    assert plaid_env == "sandbox"
-    assert plaid_secret == "sandbox-secret"
-
-
-def test_defaults_to_sandbox_when_only_sandbox_secret_defined_and_plaid_env_missing() -> (
-    None
-):
-    env = {
-        "PLAID_CLIENT_ID": "client",
-        "PLAID_SANDBOX_SECRET": "sandbox-secret",
-        # PLAID_ENV missing
-        # PLAID_PRODUCTION_SECRET missing
-        # PLAID_SECRET missing
-    }
-
-    plaid_env, plaid_secret = _resolve_plaid_env_and_secret(env)
-    assert plaid_env == "sandbox"
-    assert plaid_secret == "sandbox-secret"
-
-
-def test_uses_env_specific_secret_when_plaid_secret_missing_and_env_is_production() -> (
-    None
-):
-    env = {
-        "PLAID_CLIENT_ID": "client",
-        "PLAID_ENV": "production",
-        "PLAID_PRODUCTION_SECRET": "production-secret",
-        # PLAID_SECRET missing
-    }
-
-    plaid_env, plaid_secret = _resolve_plaid_env_and_secret(env)
-    assert plaid_env == "production"
-    assert plaid_secret == "production-secret"
-
-
-def test_plaid_secret_takes_precedence_over_env_specific_secrets() -> None:
-    env = {
-        "PLAID_CLIENT_ID": "client",
-        "PLAID_ENV": "sandbox",
-        "PLAID_SECRET": "direct-secret",
-        "PLAID_SANDBOX_SECRET": "sandbox-secret",
-        "PLAID_PRODUCTION_SECRET": "production-secret",
-    }
-
-    plaid_env, plaid_secret = _resolve_plaid_env_and_secret(env)
-    assert plaid_env == "sandbox"
-    assert plaid_secret == "direct-secret"
+from yapcli.server import BackendConfig, _resolve_plaid_env_and_secret
+
+
+@pytest.mark.parametrize(
+    ("env", "expected_env", "expected_secret"),
+    [
+        pytest.param(
+            {
+                "PLAID_CLIENT_ID": "client",
+                "PLAID_SANDBOX_SECRET": "sandbox-secret",
+                "PLAID_PRODUCTION_SECRET": "production-secret",
+                # PLAID_ENV missing
+                # PLAID_SECRET missing
+            },
+            "production",
+            "production-secret",
+            id="defaults-to-production-when-both-secrets-and-env-missing",
+        ),
+        pytest.param(
+            {
+                "PLAID_CLIENT_ID": "client",
+                "PLAID_ENV": "sandbox",
+                "PLAID_SANDBOX_SECRET": "sandbox-secret",
+                # PLAID_SECRET missing
+            },
+            "sandbox",
+            "sandbox-secret",
+            id="uses-sandbox-secret-when-plaid-secret-missing",
+        ),
+        pytest.param(
+            {
+                "PLAID_CLIENT_ID": "client",
+                "PLAID_SANDBOX_SECRET": "sandbox-secret",
+                # PLAID_ENV missing
+                # PLAID_PRODUCTION_SECRET missing
+                # PLAID_SECRET missing
+            },
+            "sandbox",
+            "sandbox-secret",
+            id="defaults-to-sandbox-when-only-sandbox-secret-and-env-missing",
+        ),
+        pytest.param(
+            {
+                "PLAID_CLIENT_ID": "client",
+                "PLAID_ENV": "production",
+                "PLAID_PRODUCTION_SECRET": "production-secret",
+                # PLAID_SECRET missing
+            },
+            "production",
+            "production-secret",
+            id="uses-production-secret-when-plaid-secret-missing",
+        ),
+        pytest.param(
+            {
+                "PLAID_CLIENT_ID": "client",
+                "PLAID_ENV": "sandbox",
+                "PLAID_SECRET": "direct-secret",
+                "PLAID_SANDBOX_SECRET": "sandbox-secret",
+                "PLAID_PRODUCTION_SECRET": "production-secret",
+            },
+            "sandbox",
+            "direct-secret",
+            id="plaid-secret-takes-precedence",
+        ),
+    ],
+)
+def test_resolve_plaid_env_and_secret(
+    env: Dict[str, str], expected_env: str, expected_secret: str
+) -> None:
+    assert _resolve_plaid_env_and_secret(env) == (expected_env, expected_secret)
+
+
+def test_shared_backend_config_is_reused_until_environment_changes(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("PLAID_CLIENT_ID", "client")
+    monkeypatch.setenv("PLAID_ENV", "sandbox")
+    monkeypatch.setenv("PLAID_SANDBOX_SECRET", "sandbox-secret")
+
+    first = BackendConfig.shared()
+    assert BackendConfig.shared() is first
+
+    monkeypatch.setenv("PLAID_SANDBOX_SECRET", "rotated-secret")
+    rotated = BackendConfig.shared()
+    assert rotated is not first
+    assert rotated.plaid_secret == "rotated-secret"
 
 
 def test_load_env_files_applies_platform_then_cwd_without_overriding_shell_env(
@@ -99,7 +111,7 @@ def test_load_env_files_applies_platform_then_cwd_without_overriding_shell_env(
     monkeypatch.delenv("PLAID_CLIENT_ID", raising=False)
     monkeypatch.delenv("PLAID_COUNTRY_CODES", raising=False)
 
-    load_env_files()
+    load_env_files(force=True)
 
     # CWD overrides platform
     assert os.getenv("PLAID_CLIENT_ID") == "from-cwd"
@@ -107,38 +119,41 @@ def test_load_env_files_applies_platform_then_cwd_without_overriding_shell_env(
     assert os.getenv("PLAID_COUNTRY_CODES") == "US"
 
 
+_PLATFORM_ENV_PATH = Path("platform.env")
+_CWD_ENV_PATH = Path("cwd.env")
+
+
+@pytest.fixture()
+def env_file_values(monkeypatch: pytest.MonkeyPatch) -> Dict[Path, Dict[str, str]]:
+    """Serve .env contents from memory; tests fill in the returned mapping."""
+
+    values: Dict[Path, Dict[str, str]] = {_PLATFORM_ENV_PATH: {}, _CWD_ENV_PATH: {}}
+    monkeypatch.setattr("yapcli.env.platform_env_file_path", lambda: _PLATFORM_ENV_PATH)
+    monkeypatch.setattr("yapcli.env.cwd_env_file_path", lambda: _CWD_ENV_PATH)
+    monkeypatch.setattr("yapcli.env._read_env_file", lambda path: dict(values[path]))
+    return values
+
+
 def test_load_env_files_does_not_override_shell_environment_value(
     monkeypatch,
-    tmp_path: Path,
+    env_file_values: Dict[Path, Dict[str, str]],
 ) -> None:
-    platform_env = tmp_path / "platform.env"
-    cwd_env = tmp_path / "cwd.env"
-
-    platform_env.write_text("PLAID_CLIENT_ID=from-platform\n")
-    cwd_env.write_text("PLAID_CLIENT_ID=from-cwd\n")
-
-    monkeypatch.setattr("yapcli.env.platform_env_file_path", lambda: platform_env)
-    monkeypatch.setattr("yapcli.env.cwd_env_file_path", lambda: cwd_env)
+    env_file_values[_PLATFORM_ENV_PATH]["PLAID_CLIENT_ID"] = "from-platform"
+    env_file_values[_CWD_ENV_PATH]["PLAID_CLIENT_ID"] = "from-cwd"
 
     monkeypatch.setenv("PLAID_CLIENT_ID", "already-set")
 
-    load_env_files()
+    load_env_files(force=True)
 
     assert os.getenv("PLAID_CLIENT_ID") == "already-set"
 
 
 def test_load_env_files_skips_unrecognized_env_var_and_warns(
     monkeypatch,
-    tmp_path: Path,
+    env_file_values: Dict[Path, Dict[str, str]],
 ) -> None:
-    platform_env = tmp_path / "platform.env"
-    cwd_env = tmp_path / "cwd.env"
-
-    platform_env.write_text("UNRECOGNIZED_VAR=from-platform\n")
-    cwd_env.write_text("PLAID_CLIENT_ID=from-cwd\n")
-
-    monkeypatch.setattr("yapcli.env.platform_env_file_path", lambda: platform_env)
-    monkeypatch.setattr("yapcli.env.cwd_env_file_path", lambda: cwd_env)
+    env_file_values[_PLATFORM_ENV_PATH]["UNRECOGNIZED_VAR"] = "from-platform"
+    env_file_values[_CWD_ENV_PATH]["PLAID_CLIENT_ID"] = "from-cwd"
 
     monkeypatch.delenv("UNRECOGNIZED_VAR", raising=False)
     monkeypatch.delenv("PLAID_CLIENT_ID", raising=False)
@@ -153,8 +168,27 @@ def test_load_env_files_skips_unrecognized_env_var_and_warns(
 
     monkeypatch.setattr("yapcli.env.logger.warning", fake_warning)
 
-    load_env_files()
+    load_env_files(force=True)
 
     assert os.getenv("UNRECOGNIZED_VAR") is None
     assert os.getenv("PLAID_CLIENT_ID") == "from-cwd"
     assert any("Skipping unrecognized env var" in w for w in warnings)
+
+
+def test_load_env_files_reads_files_once_unless_forced(
+    monkeypatch,
+    env_file_values: Dict[Path, Dict[str, str]],
+) -> None:
+    env_file_values[_CWD_ENV_PATH]["PLAID_CLIENT_ID"] = "first"
+
+    monkeypatch.delenv("PLAID_CLIENT_ID", raising=False)
+
+    load_env_files(force=True)
+    env_file_values[_CWD_ENV_PATH]["PLAID_CLIENT_ID"] = "second"
+    monkeypatch.delenv("PLAID_CLIENT_ID")
+
+    load_env_files()
+    assert os.getenv("PLAID_CLIENT_ID") is None
+
+    load_env_files(force=True)
+    assert os.getenv("PLAID_CLIENT_ID") == "second"
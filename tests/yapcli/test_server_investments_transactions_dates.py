@@ -1,44 +1,30 @@
 from __future__ import annotations
 
 import datetime as dt
-from typing import Any, Dict
+from types import MappingProxyType
+from typing import Any, Callable, Mapping
 
 from yapcli.server import PlaidBackend
 
-
-class _FakePlaidResponse:
-    def __init__(self, payload: Dict[str, Any]) -> None:
-        self._payload = payload
-
-    def to_dict(self) -> Dict[str, Any]:
-        return self._payload
-
-
-class _FakePlaidClient:
-    def __init__(self, payload: Dict[str, Any]) -> None:
-        self.payload = payload
-        self.requests: list[Dict[str, Any]] = []
-
-    def investments_transactions_get(
-        self, request: Any, **_kwargs: Any
-    ) -> _FakePlaidResponse:
-        self.requests.append(request.to_dict())
-        return _FakePlaidResponse(self.payload)
-
-
-def test_get_investments_transactions_passes_start_and_end_dates() -> None:
-    backend = PlaidBackend(
-        env={
-            "PLAID_CLIENT_ID": "client",
-            "PLAID_SECRET": "secret",
-            "PLAID_ENV": "sandbox",
-            "PLAID_PRODUCTS": "investments",
-            "PLAID_COUNTRY_CODES": "US",
-        }
-    )
+_BASE_ENV: Mapping[str, str] = MappingProxyType(
+    {
+        "PLAID_CLIENT_ID": "client",
+        "PLAID_SECRET": "secret",
+        "PLAID_ENV": "sandbox",
+        "PLAID_COUNTRY_CODES": "US",
+    }
+)
+
+
+def test_get_investments_transactions_passes_start_and_end_dates(
+    make_backend: Callable[..., PlaidBackend],
+    fake_plaid_client: Any,
+) -> None:
+    backend = make_backend(env={**_BASE_ENV, "PLAID_PRODUCTS": "investments"})
     backend.access_token = "access"
 
-    fake_client = _FakePlaidClient(payload={"investment_transactions": []})
+    fake_client = fake_plaid_client
+    fake_client.respond("investments_transactions_get", {"investment_transactions": []})
     backend.client = fake_client  # type: ignore[assignment]
 
     start_date = dt.date(2026, 1, 1)
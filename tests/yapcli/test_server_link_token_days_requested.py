@@ -1,38 +1,43 @@
 from __future__ import annotations
 
-from typing import Any, Dict
-
-from yapcli.server import PlaidBackend
-
-
-class _FakePlaidResponse:
-    def __init__(self, payload: Dict[str, Any]) -> None:
-        self._payload = payload
-
-    def to_dict(self) -> Dict[str, Any]:
-        return self._payload
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping
 
+import pytest
 
-class _FakePlaidClient:
-    def __init__(self) -> None:
-        self.requests: list[Dict[str, Any]] = []
-
-    def link_token_create(self, request: Any, **_kwargs: Any) -> _FakePlaidResponse:
-        self.requests.append(request.to_dict())
-        return _FakePlaidResponse({"link_token": "token"})
-
+from yapcli.server import PlaidBackend
 
-def test_create_link_token_sets_default_days_requested_for_transactions() -> None:
-    backend = PlaidBackend(
-        env={
-            "PLAID_CLIENT_ID": "client",
-            "PLAID_SECRET": "secret",
-            "PLAID_ENV": "sandbox",
-            "PLAID_COUNTRY_CODES": "US",
-        },
+_BASE_ENV: Mapping[str, str] = MappingProxyType(
+    {
+        "PLAID_CLIENT_ID": "client",
+        "PLAID_SECRET": "secret",
+        "PLAID_ENV": "sandbox",
+        "PLAID_COUNTRY_CODES": "US",
+    }
+)
+
+
+@pytest.mark.parametrize(
+    ("days_requested_env", "expected_days"),
+    [
+        pytest.param({}, 365, id="default"),
+        pytest.param({"YAPCLI_DAYS_REQUESTED": "90"}, 90, id="env-override"),
+        pytest.param({"YAPCLI_DAYS_REQUESTED": "0"}, 365, id="below-range"),
+        pytest.param({"YAPCLI_DAYS_REQUESTED": "abc"}, 365, id="not-an-integer"),
+    ],
+)
+def test_create_link_token_days_requested_for_transactions(
+    make_backend: Callable[..., PlaidBackend],
+    fake_plaid_client: Any,
+    days_requested_env: Dict[str, str],
+    expected_days: int,
+) -> None:
+    backend = make_backend(
+        env={**_BASE_ENV, **days_requested_env},
         products=["transactions"],
     )
-    fake_client = _FakePlaidClient()
+    fake_client = fake_plaid_client
+    fake_client.respond("link_token_create", {"link_token": "token"})
     backend.client = fake_client  # type: ignore[assignment]
 
     payload = backend.create_link_token()
@@ -41,26 +46,4 @@ def test_create_link_token_sets_default_days_requested_for_transactions() -> Non
     assert len(fake_client.requests) == 1
     transactions = fake_client.requests[0].get("transactions")
     assert isinstance(transactions, dict)
-    assert transactions.get("days_requested") == 365
-
-
-def test_create_link_token_uses_env_days_requested_override() -> None:
-    backend = PlaidBackend(
-        env={
-            "PLAID_CLIENT_ID": "client",
-            "PLAID_SECRET": "secret",
-            "PLAID_ENV": "sandbox",
-            "PLAID_COUNTRY_CODES": "US",
-            "YAPCLI_DAYS_REQUESTED": "90",
-        },
-        products=["transactions"],
-    )
-    fake_client = _FakePlaidClient()
-    backend.client = fake_client  # type: ignore[assignment]
-
-    backend.create_link_token()
-
-    assert len(fake_client.requests) == 1
-    transactions = fake_client.requests[0].get("transactions")
-    assert isinstance(transactions, dict)
-    assert transactions.get("days_requested") == 90
+    assert transactions.get("days_requested") == expected_days
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Callable, Dict
+
+from yapcli.secrets import load_credentials
+from yapcli.server import PlaidBackend
+
+_BASE_ENV: Dict[str, str] = {
+    "PLAID_CLIENT_ID": "client",
+    "PLAID_SECRET": "secret",
+    "PLAID_ENV": "sandbox",
+    "PLAID_COUNTRY_CODES": "US",
+}
+
+
+def test_persist_credentials_replaces_secrets_atomically(
+    tmp_path: Path, make_backend: Callable[..., PlaidBackend]
+) -> None:
+    secrets_dir = tmp_path / "secrets"
+    secrets_dir.mkdir()
+    (secrets_dir / "ins_1_access_token").write_text("old-access-token")
+    backend = make_backend(dict(_BASE_ENV))
+    backend.secrets_dir = secrets_dir
+
+    backend.persist_credentials(
+        institution_id="ins_1", item_id="item-1", token="access-1"
+    )
+
+    assert sorted(os.listdir(secrets_dir)) == ["ins_1_access_token", "ins_1_item_id"]
+    assert load_credentials(institution_id="ins_1", secrets_dir=secrets_dir) == (
+        "item-1",
+        "access-1",
+    )
+    assert (secrets_dir / "ins_1_access_token").stat().st_mode & 0o077 == 0
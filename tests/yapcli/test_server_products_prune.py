@@ -1,11 +1,21 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+from types import MappingProxyType
+from typing import Any, Dict, Mapping
 
 import pytest
 
 from yapcli.server import PlaidBackend
 
+_BASE_ENV: Mapping[str, str] = MappingProxyType(
+    {
+        "PLAID_CLIENT_ID": "client",
+        "PLAID_SECRET": "secret",
+        "PLAID_ENV": "sandbox",
+        "PLAID_COUNTRY_CODES": "US",
+    }
+)
+
 
 def test_backend_prunes_products_using_consented_products(
     monkeypatch: pytest.MonkeyPatch,
@@ -22,12 +32,7 @@ def test_backend_prunes_products_using_consented_products(
     monkeypatch.setattr(PlaidBackend, "get_item", fake_get_item)
 
     backend = PlaidBackend(
-        env={
-            "PLAID_CLIENT_ID": "client",
-            "PLAID_SECRET": "secret",
-            "PLAID_ENV": "sandbox",
-            "PLAID_COUNTRY_CODES": "US",
-        },
+        env=dict(_BASE_ENV),
         access_token="access",
         item_id="item",
         products=["transactions", "investments"],
@@ -51,12 +56,7 @@ def test_backend_falls_back_to_consented_when_intersection_empty(
     monkeypatch.setattr(PlaidBackend, "get_item", fake_get_item)
 
     backend = PlaidBackend(
-        env={
-            "PLAID_CLIENT_ID": "client",
-            "PLAID_SECRET": "secret",
-            "PLAID_ENV": "sandbox",
-            "PLAID_COUNTRY_CODES": "US",
-        },
+        env=dict(_BASE_ENV),
         access_token="access",
         item_id="item",
         products=["transactions"],
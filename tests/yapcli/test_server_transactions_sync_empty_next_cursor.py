@@ -1,72 +1,42 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from types import MappingProxyType
+from typing import Any, Callable, List, Mapping
 
 import pytest
 
 from yapcli.server import PlaidBackend
 
+_BASE_ENV: Mapping[str, str] = MappingProxyType(
+    {
+        "PLAID_CLIENT_ID": "client",
+        "PLAID_SECRET": "secret",
+        "PLAID_ENV": "sandbox",
+        "PLAID_COUNTRY_CODES": "US",
+    }
+)
 
-class _FakePlaidResponse:
-    def __init__(self, payload: Dict[str, Any]) -> None:
-        self._payload = payload
-
-    def to_dict(self) -> Dict[str, Any]:
-        return self._payload
-
-
-class _FakePlaidClient:
-    def __init__(self, pages: List[Dict[str, Any]]) -> None:
-        self._pages = pages
-        self.calls = 0
-
-    def transactions_sync(self, *args: Any, **_kwargs: Any) -> _FakePlaidResponse:
-        self.calls += 1
-        idx = min(self.calls - 1, len(self._pages) - 1)
-        return _FakePlaidResponse(self._pages[idx])
+# Read-only: the fake client serves the same page for every call.
+_EMPTY_CURSOR_PAGE: Mapping[str, Any] = MappingProxyType(
+    {
+        "next_cursor": "",
+        "has_more": True,
+        "added": (),
+        "modified": (),
+        "removed": (),
+    }
+)
 
 
 def test_transactions_sync_stops_after_two_empty_next_cursor_retries(
-    monkeypatch: pytest.MonkeyPatch,
+    make_backend: Callable[..., PlaidBackend],
+    fake_plaid_client: Any,
 ) -> None:
-    # Avoid waiting during retries.
-    monkeypatch.setattr("yapcli.server.time.sleep", lambda _seconds: None)
-
-    backend = PlaidBackend(
-        env={
-            "PLAID_CLIENT_ID": "client",
-            "PLAID_SECRET": "secret",
-            "PLAID_ENV": "sandbox",
-            "PLAID_PRODUCTS": "transactions",
-            "PLAID_COUNTRY_CODES": "US",
-        }
-    )
+    backend = make_backend(env={**_BASE_ENV, "PLAID_PRODUCTS": "transactions"})
     backend.access_token = "access"
 
-    pages = [
-        {
-            "next_cursor": "",
-            "has_more": True,
-            "added": [],
-            "modified": [],
-            "removed": [],
-        },
-        {
-            "next_cursor": "",
-            "has_more": True,
-            "added": [],
-            "modified": [],
-            "removed": [],
-        },
-        {
-            "next_cursor": "",
-            "has_more": True,
-            "added": [],
-            "modified": [],
-            "removed": [],
-        },
-    ]
-    fake_client = _FakePlaidClient(pages)
+    fake_client = fake_plaid_client
+    fake_client.respond("transactions_sync", _EMPTY_CURSOR_PAGE)
     backend.client = fake_client  # type: ignore[assignment]
 
     payload = backend.get_transactions(account_id="acc")
@@ -77,3 +47,26 @@ def test_transactions_sync_stops_after_two_empty_next_cursor_retries(
     err = payload["error"]
     assert isinstance(err, dict)
     assert err.get("error_code") == "EMPTY_NEXT_CURSOR"
+
+
+def test_transactions_sync_does_not_wait_when_empty_cursor_has_no_more(
+    monkeypatch: pytest.MonkeyPatch,
+    make_backend: Callable[..., PlaidBackend],
+    fake_plaid_client: Any,
+) -> None:
+    sleeps: List[float] = []
+    monkeypatch.setattr("yapcli.server.time.sleep", sleeps.append)
+
+    backend = make_backend(env={**_BASE_ENV, "PLAID_PRODUCTS": "transactions"})
+    backend.access_token = "access"
+
+    fake_client = fake_plaid_client
+    fake_client.respond("transactions_sync", {**_EMPTY_CURSOR_PAGE, "has_more": False})
+    backend.client = fake_client  # type: ignore[assignment]
+
+    payload = backend.get_transactions(account_id="acc", cursor="prev")
+
+    assert fake_client.calls == 1
+    assert sleeps == []
+    assert payload.get("error") is None
+    assert payload.get("cursor") == "prev"
@@ -1,14 +1,20 @@
 """Public package interface for Yet Another Plaid CLI."""
 
-from importlib import metadata
+from yapcli.env import load_default_env_files
 
-from yapcli.env import load_env_files
-
-load_env_files()
+load_default_env_files()
 
 try:
-    __version__ = metadata.version("yapcli")
-except metadata.PackageNotFoundError:  # pragma: no cover - defensive fallback
-    __version__ = "0.0.0"
+    # Written by setuptools_scm at build/install time.
+    from yapcli._version import __version__  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - source checkout without a build
+    # Imported here: importlib.metadata is slow to import and installed builds
+    # never need it.
+    from importlib import metadata
+
+    try:
+        __version__ = metadata.version("yapcli")
+    except metadata.PackageNotFoundError:  # pragma: no cover - defensive fallback
+        __version__ = "0.0.0"
 
 __all__ = ["__version__"]
@@ -1,19 +1,33 @@
 from __future__ import annotations
 
-import re
+import functools
+import hashlib
+import json
+import os
+import tempfile
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional, Sequence, Set, cast
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Set, Tuple, cast
 
-import questionary
 import typer
 
 from yapcli.institutions import DiscoveredInstitution
-from yapcli.institutions import discover_institutions
-from yapcli.secrets import load_credentials
-from yapcli.server import PlaidBackend
+from yapcli.institutions import clear_institutions_cache, discover_institutions
+from yapcli.secrets import load_credentials, secrets_dir_fingerprint
+from yapcli.server import BackendConfig, PlaidBackend, plaid_settings_key
+from yapcli.utils import default_cache_dir, map_concurrently
 
-_INSTITUTION_ID_RE = re.compile(r"ins_\d+")
+if TYPE_CHECKING:
+    import questionary
+
+
+# Maps institution_id -> account_ids from earlier discovery, so account-id
+# lookups only query the institutions that own the requested accounts. Kept
+# in the cache dir, one file per secrets dir, so it never mixes with secrets.
+ACCOUNT_INDEX_PREFIX = "account_index_"
+
+# Plaid account fields read by _discover_accounts, in unpacking order.
+_ACCOUNT_FIELDS = ("account_id", "type", "name", "official_name", "subtype", "mask")
 
 
 @dataclass(frozen=True)
@@ -26,17 +40,32 @@ class DiscoveredAccount:
     subtype: Optional[str]
     mask: Optional[str]
 
+    @functools.cached_property
     def choice_title(self) -> str:
+        # cached_property stores into __dict__ directly, so it works on a
+        # frozen dataclass.
         bank = self.bank_name or self.institution_id
         display_name = self.name or "(unnamed)"
         type = self.type or "unknown"
         subtype = self.subtype or "unknown"
-        mask = f"••••{self.mask}" if self.mask else ""
-        return f"{bank} - {display_name} ({type}/{subtype}) {mask}".strip()
+        if self.mask:
+            return f"{bank} - {display_name} ({type}/{subtype}) ••••{self.mask}"
+        return f"{bank} - {display_name} ({type}/{subtype})"
+
+
+def _is_institution_id(value: str) -> bool:
+    """Return True for Plaid institution ids (``ins_`` followed by digits).
+
+    str.isdecimal() accepts exactly the digits a regex ``\\d`` would.
+    """
+
+    return value.startswith("ins_") and value[4:].isdecimal()
 
 
 def _normalize_ids(ids: Optional[Sequence[str]]) -> List[str]:
-    return [value for value in (ids or []) if value.strip() != ""]
+    # Drop blanks and repeats (keeping first-seen order) so an id passed twice
+    # is only fetched and written once.
+    return list(dict.fromkeys(value for value in (ids or []) if value.strip() != ""))
 
 
 def _validate_account_types(
@@ -48,11 +77,10 @@ def _validate_account_types(
     if allowed_types is None:
         return selected_accounts
 
-    def is_allowed(account: DiscoveredAccount) -> bool:
-        return account.type in allowed_types
-
-    disallowed = [account for account in selected_accounts if not is_allowed(account)]
-    allowed = [account for account in selected_accounts if is_allowed(account)]
+    allowed: List[DiscoveredAccount] = []
+    disallowed: List[DiscoveredAccount] = []
+    for account in selected_accounts:
+        (allowed if account.type in allowed_types else disallowed).append(account)
 
     if ids_were_account_ids and disallowed:
         parts: List[str] = []
@@ -109,9 +137,7 @@ def resolve_target_accounts(
     discovered_institutions = discover_institutions(secrets_dir=secrets_dir)
 
     ids_list = _normalize_ids(ids)
-    is_institution_id = [
-        bool(_INSTITUTION_ID_RE.fullmatch(value)) for value in ids_list
-    ]
+    institution_id_count = sum(_is_institution_id(value) for value in ids_list)
 
     selected_accounts: List[DiscoveredAccount]
 
@@ -139,7 +165,7 @@ def resolve_target_accounts(
         return selected_accounts
 
     # All ids match institution id pattern: treat as institutions.
-    if all(is_institution_id):
+    if institution_id_count == len(ids_list):
         institutions_by_id = {
             inst.institution_id: inst for inst in discovered_institutions
         }
@@ -171,7 +197,7 @@ def resolve_target_accounts(
         return selected_accounts
 
     # Mixed institutions + account ids is ambiguous.
-    if any(is_institution_id):
+    if institution_id_count:
         raise typer.BadParameter(
             "Pass either institution ids (ins_123) or account_ids, not a mix."
         )
@@ -182,31 +208,47 @@ def resolve_target_accounts(
             "--all-accounts is only valid when passing institution ids."
         )
 
-    accounts = _discover_accounts(
+    accounts = []
+    owners = _indexed_owners(
+        account_ids=ids_list,
         institutions=discovered_institutions,
         secrets_dir=secrets_dir,
     )
+    if owners is not None:
+        accounts = _discover_accounts(institutions=owners, secrets_dir=secrets_dir)
+        found = {account.account_id for account in accounts}
+        if not all(value in found for value in ids_list):
+            accounts = []  # stale index: fall back to full discovery
+    if not accounts:
+        accounts = _discover_accounts(
+            institutions=discovered_institutions,
+            secrets_dir=secrets_dir,
+        )
     if not accounts:
         raise typer.BadParameter("No accounts found for saved institutions")
 
-    accounts_by_id: Dict[str, List[DiscoveredAccount]] = {}
+    # First match per account_id plus a match count, built in one pass.
+    first_by_id: Dict[str, DiscoveredAccount] = {}
+    match_counts: Dict[str, int] = {}
     for account in accounts:
-        accounts_by_id.setdefault(account.account_id, []).append(account)
+        account_id = account.account_id
+        match_counts[account_id] = match_counts.get(account_id, 0) + 1
+        first_by_id.setdefault(account_id, account)
 
-    missing = [value for value in ids_list if value not in accounts_by_id]
+    missing = [value for value in ids_list if value not in match_counts]
     if missing:
         raise typer.BadParameter(
             "Unknown account_id(s): " + ", ".join(sorted(set(missing)))
         )
 
-    ambiguous = [value for value in ids_list if len(accounts_by_id.get(value, [])) > 1]
+    ambiguous = [value for value in ids_list if match_counts[value] > 1]
     if ambiguous:
         raise typer.BadParameter(
             "Ambiguous account_id(s) (match multiple institutions): "
             + ", ".join(sorted(set(ambiguous)))
         )
 
-    selected_accounts = [accounts_by_id[value][0] for value in ids_list]
+    selected_accounts = [first_by_id[value] for value in ids_list]
     return _validate_account_types(
         selected_accounts=selected_accounts,
         allowed_types=allowed_account_types,
@@ -214,67 +256,211 @@ def resolve_target_accounts(
     )
 
 
+def _optional_str(value: object) -> Optional[str]:
+    return str(value) if value is not None else None
+
+
+def clear_discovery_cache() -> None:
+    """Forget cached institution and account discovery results."""
+
+    clear_institutions_cache()
+    _discover_accounts_cached.cache_clear()
+
+
+def account_index_path(secrets_dir: Path) -> Path:
+    digest = hashlib.sha256(str(secrets_dir.resolve()).encode()).hexdigest()
+    return default_cache_dir() / f"{ACCOUNT_INDEX_PREFIX}{digest[:16]}.json"
+
+
+def _load_account_index(
+    *, secrets_dir: Path, fingerprint: Tuple[Tuple[str, int], ...]
+) -> Dict[str, List[str]]:
+    """Return the saved institution_id -> account_ids index.
+
+    An index written for a different set of secrets files is ignored.
+    """
+
+    try:
+        raw = json.loads(account_index_path(secrets_dir).read_text())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(raw, dict):
+        return {}
+    if raw.get("fingerprint") != [list(entry) for entry in fingerprint]:
+        return {}
+
+    accounts = raw.get("accounts")
+    if not isinstance(accounts, dict):
+        return {}
+    return {
+        institution_id: [value for value in account_ids if isinstance(value, str)]
+        for institution_id, account_ids in accounts.items()
+        if isinstance(institution_id, str) and isinstance(account_ids, list)
+    }
+
+
+def _save_account_index(
+    *,
+    secrets_dir: Path,
+    fingerprint: Tuple[Tuple[str, int], ...],
+    index: Dict[str, List[str]],
+) -> None:
+    serialized = json.dumps(
+        {"fingerprint": [list(entry) for entry in fingerprint], "accounts": index}
+    )
+    index_path = account_index_path(secrets_dir)
+    # Discovery runs for most commands; leave an up-to-date index untouched.
+    try:
+        if index_path.read_text() == serialized:
+            return
+    except OSError:
+        pass
+    # Write to a temp file and rename so readers never see a partial index.
+    try:
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(
+            dir=index_path.parent, prefix=f"{index_path.name}.", suffix=".tmp"
+        )
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, "w") as handle:
+            handle.write(serialized)
+        os.replace(tmp_name, index_path)
+    except OSError:
+        Path(tmp_name).unlink(missing_ok=True)
+
+
+def _indexed_owners(
+    *,
+    account_ids: List[str],
+    institutions: List[DiscoveredInstitution],
+    secrets_dir: Path,
+) -> Optional[List[DiscoveredInstitution]]:
+    """Return the institutions owning account_ids according to the saved index.
+
+    Returns None unless the index covers every saved institution and maps each
+    requested account_id to exactly one of them.
+    """
+
+    index = _load_account_index(
+        secrets_dir=secrets_dir, fingerprint=secrets_dir_fingerprint(secrets_dir)
+    )
+    if not index or any(inst.institution_id not in index for inst in institutions):
+        return None
+
+    owner_ids: Dict[str, List[str]] = {}
+    for inst in institutions:
+        for account_id in index[inst.institution_id]:
+            owner_ids.setdefault(account_id, []).append(inst.institution_id)
+
+    wanted: Set[str] = set()
+    for account_id in account_ids:
+        owners = owner_ids.get(account_id)
+        if owners is None or len(owners) != 1:
+            return None
+        wanted.add(owners[0])
+
+    return [inst for inst in institutions if inst.institution_id in wanted]
+
+
 def _discover_accounts(
     *, institutions: List[DiscoveredInstitution], secrets_dir: Path
 ) -> List[DiscoveredAccount]:
-    results: List[DiscoveredAccount] = []
+    # Cached until a secrets file or the Plaid settings change, so repeated
+    # resolution in one process does not repeat the /accounts/get round-trips.
+    fingerprint = secrets_dir_fingerprint(secrets_dir)
+    accounts = list(
+        _discover_accounts_cached(
+            tuple(institutions),
+            secrets_dir,
+            fingerprint,
+            plaid_settings_key(),
+        )
+    )
+
+    index = _load_account_index(secrets_dir=secrets_dir, fingerprint=fingerprint)
+    updated = dict(index)
     for inst in institutions:
+        updated[inst.institution_id] = []
+    for account in accounts:
+        updated[account.institution_id].append(account.account_id)
+    if updated != index:
+        _save_account_index(
+            secrets_dir=secrets_dir, fingerprint=fingerprint, index=updated
+        )
+
+    return accounts
+
+
+@functools.lru_cache(maxsize=8)
+def _discover_accounts_cached(
+    institutions: Tuple[DiscoveredInstitution, ...],
+    secrets_dir: Path,
+    _fingerprint: Tuple[Tuple[str, int], ...],
+    _settings_key: Tuple[Optional[str], ...],
+) -> Tuple[DiscoveredAccount, ...]:
+    results: List[DiscoveredAccount] = []
+    if not institutions:
+        return ()
+
+    config = BackendConfig.shared()
+
+    def fetch(inst: DiscoveredInstitution) -> Optional[Dict[str, Any]]:
         try:
             item_id, access_token = load_credentials(
                 institution_id=inst.institution_id, secrets_dir=secrets_dir
             )
-            backend = PlaidBackend(access_token=access_token, item_id=item_id)
-            payload = backend.get_accounts()
+            backend = PlaidBackend(
+                access_token=access_token, item_id=item_id, config=config
+            )
+            return backend.get_accounts()
         except (FileNotFoundError, ValueError):
-            continue
+            return None
+
+    # One /accounts/get round-trip per institution; overlap them.
+    payloads = map_concurrently(fetch, institutions)
 
+    for inst, payload in zip(institutions, payloads):
         accounts = payload.get("accounts") if isinstance(payload, dict) else None
         if not isinstance(accounts, list):
             continue
 
-        for account in accounts:
-            if not isinstance(account, dict):
-                continue
-            account_id = account.get("account_id")
-            if not isinstance(account_id, str) or not account_id:
-                continue
-
-            account_type = account.get("type")
-            name = account.get("name") or account.get("official_name")
-            subtype = account.get("subtype")
-            mask = account.get("mask")
-
-            results.append(
-                DiscoveredAccount(
-                    institution_id=inst.institution_id,
-                    bank_name=inst.bank_name,
-                    account_id=account_id,
-                    type=str(account_type) if account_type is not None else None,
-                    name=str(name) if name is not None else None,
-                    subtype=str(subtype) if subtype is not None else None,
-                    mask=str(mask) if mask is not None else None,
-                )
+        results.extend(
+            DiscoveredAccount(
+                institution_id=inst.institution_id,
+                bank_name=inst.bank_name,
+                account_id=account_id,
+                type=_optional_str(account_type),
+                name=_optional_str(name or official_name),
+                subtype=_optional_str(subtype),
+                mask=_optional_str(mask),
             )
+            for account_id, account_type, name, official_name, subtype, mask in (
+                map(account.get, _ACCOUNT_FIELDS)
+                for account in accounts
+                if isinstance(account, dict)
+            )
+            if isinstance(account_id, str) and account_id
+        )
 
-    return results
+    return tuple(results)
 
 
 def _prompt_for_accounts(accounts: List[DiscoveredAccount]) -> List[DiscoveredAccount]:
     if not accounts:
         raise ValueError("No accounts available")
 
-    account_by_key: Dict[str, DiscoveredAccount] = {}
-    choices: List[questionary.Choice] = []
-    for idx, account in enumerate(accounts):
-        key = f"{account.institution_id}|{account.account_id}"
-        account_by_key[key] = account
-        choices.append(
-            questionary.Choice(
-                title=account.choice_title(),
-                value=key,
-                checked=(idx == 0),
-            )
-        )
+    # Imported lazily: questionary pulls in prompt_toolkit, which non-interactive
+    # runs never need.
+    import questionary
+
+    keys = [f"{account.institution_id}|{account.account_id}" for account in accounts]
+    choice = questionary.Choice
+    choices: List[questionary.Choice] = [
+        choice(account.choice_title, key, checked=(idx == 0))
+        for idx, (key, account) in enumerate(zip(keys, accounts))
+    ]
 
     try:
         selected_keys_raw = questionary.checkbox(
@@ -289,9 +475,13 @@ def _prompt_for_accounts(accounts: List[DiscoveredAccount]) -> List[DiscoveredAc
 
     selected_keys = cast(List[str], selected_keys_raw)
 
-    selected: List[DiscoveredAccount] = []
-    for key in selected_keys:
-        maybe_account = account_by_key.get(key)
-        if maybe_account is not None:
-            selected.append(maybe_account)
-    return selected
+    # Everything selected: skip the key lookup entirely.
+    if len(selected_keys) == len(accounts):
+        return list(accounts)
+
+    account_by_key: Dict[str, DiscoveredAccount] = dict(zip(keys, accounts))
+    return [
+        account
+        for key in selected_keys
+        if (account := account_by_key.get(key)) is not None
+    ]
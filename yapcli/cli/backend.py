@@ -6,22 +6,23 @@ from yapcli.server import PlaidBackend
 
 app = typer.Typer()
 
-_ALLOWED_PRODUCTS = {"transactions", "investments"}
+_ALLOWED_PRODUCTS = frozenset({"transactions", "investments"})
 
 
 def _parse_products(value: str | None) -> list[str] | None:
     if value is None:
         return None
-    raw = value.strip()
-    if raw == "":
-        return None
-
-    parts = [p.strip().lower() for p in raw.split(",")]
-    parts = [p for p in parts if p]
-    if not parts:
-        return None
+    parts: list[str] = []
+    invalid: dict[str, None] = {}
+    for token in value.split(","):
+        product = token.strip().lower()
+        if not product:
+            continue
+        if product in _ALLOWED_PRODUCTS:
+            parts.append(product)
+        else:
+            invalid[product] = None
 
-    invalid = sorted({p for p in parts if p not in _ALLOWED_PRODUCTS})
     if invalid:
         allowed = ", ".join(sorted(_ALLOWED_PRODUCTS))
         bad = ", ".join(invalid)
@@ -29,6 +30,8 @@ def _parse_products(value: str | None) -> list[str] | None:
             f"Invalid --products value(s): {bad}. Allowed values: {allowed}"
         )
 
+    if not parts:
+        return None
     return parts
 
 
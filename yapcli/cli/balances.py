@@ -3,9 +3,10 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-import pandas as pd
 import typer
 
+from yapcli.cli.fetch import fetch_per_institution
+from yapcli.cli.frames import flatten_record, write_csv
 from yapcli.secrets import load_credentials
 from yapcli.server import PlaidBackend
 from yapcli.institutions import (
@@ -13,26 +14,40 @@ from yapcli.institutions import (
     discover_institutions,
     prompt_for_institutions,
 )
-from yapcli.utils import default_output_dir, default_secrets_dir, timestamp_for_filename
+from yapcli.utils import (
+    default_output_dir,
+    default_secrets_dir,
+    timestamp_for_filename,
+)
 
 app = typer.Typer(help="Fetch account/balance information for a linked institution.")
 
 
-def _payload_to_dataframe(
-    *, payload: Dict[str, Any], institution_id: str
-) -> pd.DataFrame:
+def _write_payload_csv(
+    *, payload: Dict[str, Any], institution_id: str, out_path: Path
+) -> None:
+    """Write one CSV row per account (or the raw payload, e.g. an error)."""
+
+    fieldnames: Dict[str, None] = {"institution_id": None}
+    rows: List[Dict[str, Any]] = []
+
     accounts = payload.get("accounts")
     if isinstance(accounts, list):
-        frame = pd.json_normalize(accounts)
-        frame.insert(0, "institution_id", institution_id)
         request_id = payload.get("request_id")
+        for account in accounts:
+            row = {"institution_id": institution_id, **flatten_record(account)}
+            fieldnames.update(dict.fromkeys(row))
+            rows.append(row)
         if request_id is not None:
-            frame["request_id"] = request_id
-        return frame
+            fieldnames["request_id"] = None
+            for row in rows:
+                row["request_id"] = request_id
+    else:
+        row = {"institution_id": institution_id, **flatten_record(payload)}
+        fieldnames.update(dict.fromkeys(row))
+        rows.append(row)
 
-    frame = pd.json_normalize(payload)
-    frame.insert(0, "institution_id", institution_id)
-    return frame
+    write_csv(out_path, fieldnames=list(fieldnames), rows=rows)
 
 
 def get_accounts_for_institution(*, institution_id: str) -> Dict[str, Any]:
@@ -80,14 +95,14 @@ def get_balances(
     balances_out_dir = out_dir or (default_output_dir() / "balances")
     balances_out_dir.mkdir(parents=True, exist_ok=True)
 
-    timestamp = timestamp_for_filename()
-    for inst in selected_institutions:
-        try:
-            payload = get_accounts_for_institution(institution_id=inst)
-        except (FileNotFoundError, ValueError) as exc:
-            payload = {"error": str(exc)}
+    # Fetch every institution concurrently, then write outputs in selection order.
+    payload_by_institution = fetch_per_institution(
+        lambda inst: get_accounts_for_institution(institution_id=inst),
+        selected_institutions,
+    )
 
-        frame = _payload_to_dataframe(payload=payload, institution_id=inst)
+    timestamp = timestamp_for_filename()
+    for inst, payload in payload_by_institution.items():
         out_path = balances_out_dir / f"{inst}_{timestamp}.csv"
-        frame.to_csv(out_path, index=False)
+        _write_payload_csv(payload=payload, institution_id=inst, out_path=out_path)
         typer.echo(str(out_path))
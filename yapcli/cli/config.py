@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import os
 from pathlib import Path
-from typing import Dict
+from typing import Any, Dict, Tuple
 
+import click
 import questionary
 import typer
 from dotenv import dotenv_values
@@ -17,25 +19,48 @@ from yapcli.utils import (
 
 app = typer.Typer(help="Manage yapcli configuration values.")
 _KNOWN_ENV_KEYS = CONSUMED_ENV_VARS
-_KNOWN_ENV_KEYS_SET = set(_KNOWN_ENV_KEYS)
+_KNOWN_ENV_KEYS_SET = frozenset(_KNOWN_ENV_KEYS)
+SIMPLE_PROMPTS_ENV_VAR = "YAPCLI_SIMPLE_PROMPTS"
+
+
+# Parsed .env files keyed by (path, mtime_ns, size); a rewrite changes the key.
+_ENV_FILE_CACHE: Dict[Tuple[str, int, int], Dict[str, str]] = {}
 
 
 def _read_env_file(path: Path) -> Dict[str, str]:
-    if not path.exists():
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
         return {}
 
-    values = dotenv_values(path)
-    return {key: value for key, value in values.items() if value is not None}
+    key = (str(path), stat.st_mtime_ns, stat.st_size)
+    values = _ENV_FILE_CACHE.get(key)
+    if values is None:
+        parsed = dotenv_values(path)
+        values = {k: v for k, v in parsed.items() if v is not None}
+        _ENV_FILE_CACHE[key] = values
+    # Callers mutate the result before writing it back.
+    return dict(values)
+
+
+def _forget_env_file(path: Path) -> None:
+    path_str = str(path)
+    for key in [key for key in _ENV_FILE_CACHE if key[0] == path_str]:
+        del _ENV_FILE_CACHE[key]
 
 
 def _write_env_file(path: Path, values: Dict[str, str]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
+    _forget_env_file(path)
 
     ordered_keys = [key for key in _KNOWN_ENV_KEYS if key in values]
-    ordered_keys.extend(key for key in sorted(values) if key not in _KNOWN_ENV_KEYS_SET)
+    if len(ordered_keys) != len(values):
+        ordered_keys.extend(sorted(values.keys() - _KNOWN_ENV_KEYS_SET))
 
-    lines = [f"{key}={values[key]}" for key in ordered_keys]
-    path.write_text("\n".join(lines) + "\n")
+    # str.encode() is UTF-8, matching how dotenv_values reads the file back.
+    path.write_bytes(
+        b"".join(f"{key}={values[key]}\n".encode() for key in ordered_keys)
+    )
 
 
 def _is_sensitive_key(key: str) -> bool:
@@ -43,7 +68,28 @@ def _is_sensitive_key(key: str) -> bool:
     return "SECRET" in key_upper or "TOKEN" in key_upper or "PASSWORD" in key_upper
 
 
+def _use_simple_prompts() -> bool:
+    """Return True when YAPCLI_SIMPLE_PROMPTS asks for plain line prompts.
+
+    Plain prompts skip prompt_toolkit's per-prompt terminal setup, which adds
+    noticeable latency to multi-question flows like ``config init``.
+    """
+
+    raw = os.environ.get(SIMPLE_PROMPTS_ENV_VAR, "").strip().lower()
+    return raw in {"1", "true", "yes"}
+
+
+def _simple_prompt(message: str, **kwargs: Any) -> Any:
+    try:
+        return typer.prompt(message, **kwargs)
+    except click.Abort as exc:
+        raise typer.Exit(code=1) from exc
+
+
 def _ask_text(*, message: str, default: str = "") -> str:
+    if _use_simple_prompts():
+        return str(_simple_prompt(message, default=default)).strip()
+
     try:
         answer = questionary.text(message, default=default).ask()
     except KeyboardInterrupt as exc:
@@ -55,10 +101,15 @@ def _ask_text(*, message: str, default: str = "") -> str:
 
 
 def _ask_password(*, message: str, default: str = "") -> str:
-    try:
-        answer = questionary.password(message).ask()
-    except KeyboardInterrupt as exc:
-        raise typer.Exit(code=1) from exc
+    if _use_simple_prompts():
+        answer = _simple_prompt(
+            message, default="", hide_input=True, show_default=False
+        )
+    else:
+        try:
+            answer = questionary.password(message).ask()
+        except KeyboardInterrupt as exc:
+            raise typer.Exit(code=1) from exc
 
     if answer is None:
         raise typer.Exit(code=1)
@@ -70,6 +121,12 @@ def _ask_password(*, message: str, default: str = "") -> str:
 
 
 def _ask_confirm(*, message: str, default: bool = False) -> bool:
+    if _use_simple_prompts():
+        try:
+            return typer.confirm(message, default=default)
+        except click.Abort as exc:
+            raise typer.Exit(code=1) from exc
+
     try:
         answer = questionary.confirm(message, default=default).ask()
     except KeyboardInterrupt as exc:
@@ -81,6 +138,12 @@ def _ask_confirm(*, message: str, default: bool = False) -> bool:
 
 
 def _ask_select_key(*, message: str) -> str:
+    if _use_simple_prompts():
+        answer = _simple_prompt(
+            message, type=click.Choice(_KNOWN_ENV_KEYS, case_sensitive=False)
+        )
+        return str(answer).strip().upper()
+
     try:
         answer = questionary.select(message, choices=list(_KNOWN_ENV_KEYS)).ask()
     except KeyboardInterrupt as exc:
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional
+
+from yapcli.utils import default_cache_dir, map_concurrently
+
+# Seconds a fetched payload may be reused from the on-disk cache; unset or 0
+# disables the cache.
+FETCH_CACHE_TTL_ENV_VAR = "YAPCLI_FETCH_CACHE_TTL_SECONDS"
+
+# Endpoints whose payloads are cached, each as "<endpoint>_<hash>.json".
+HOLDINGS_ENDPOINT = "holdings"
+INVESTMENTS_TRANSACTIONS_ENDPOINT = "investments_transactions"
+FETCH_CACHE_PREFIXES = (
+    f"{HOLDINGS_ENDPOINT}_",
+    f"{INVESTMENTS_TRANSACTIONS_ENDPOINT}_",
+)
+
+
+def fetch_per_institution(
+    fetch: Callable[[str], Dict[str, Any]],
+    institution_ids: Iterable[str],
+) -> Dict[str, Dict[str, Any]]:
+    """Call ``fetch`` once per distinct institution id, concurrently.
+
+    Missing or empty secrets are reported as ``{"error": ...}`` payloads so one
+    institution's failure does not abort the rest. The result preserves the
+    order in which institution ids were first seen.
+    """
+
+    def fetch_one(institution_id: str) -> Dict[str, Any]:
+        try:
+            return fetch(institution_id)
+        except (FileNotFoundError, ValueError) as exc:
+            return {"error": str(exc)}
+
+    distinct_ids = list(dict.fromkeys(institution_ids))
+    return dict(zip(distinct_ids, map_concurrently(fetch_one, distinct_ids)))
+
+
+def fetch_cache_ttl_seconds(env: Optional[Mapping[str, str]] = None) -> float:
+    raw = (env if env is not None else os.environ).get(FETCH_CACHE_TTL_ENV_VAR, "")
+    try:
+        ttl = float(raw.strip())
+    except ValueError:
+        return 0.0
+    return ttl if ttl > 0 else 0.0
+
+
+def cached_payload(
+    endpoint: str,
+    *,
+    key: Iterable[Any],
+    fetch: Callable[[], Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Return ``fetch()``, reusing a recent on-disk copy when the cache is enabled.
+
+    Payloads are stored as JSON under the cache directory, named by endpoint and
+    a hash of ``key`` (e.g. the item id and request dates). Error payloads are
+    never cached.
+    """
+
+    ttl = fetch_cache_ttl_seconds()
+    if not ttl:
+        return fetch()
+
+    digest = hashlib.sha256(
+        json.dumps([endpoint, *key], default=str).encode("utf-8")
+    ).hexdigest()
+    cache_dir = default_cache_dir()
+    cache_path = cache_dir / f"{endpoint}_{digest[:32]}.json"
+    try:
+        if time.time() - cache_path.stat().st_mtime < ttl:
+            cached = json.loads(cache_path.read_bytes())
+            if isinstance(cached, dict):
+                return cached
+    except (OSError, ValueError):
+        pass
+    _prune_expired_payloads(cache_dir, endpoint=endpoint, ttl=ttl)
+
+    payload = fetch()
+    if payload.get("error") is None:
+        _save_cached_payload(cache_path, payload)
+    return payload
+
+
+def _prune_expired_payloads(cache_dir: Path, *, endpoint: str, ttl: float) -> None:
+    """Delete ``endpoint``'s cached payloads that are older than ``ttl``.
+
+    Keys include request dates, so expired entries would otherwise pile up.
+    """
+
+    cutoff = time.time() - ttl
+    try:
+        with os.scandir(cache_dir) as entries:
+            for entry in entries:
+                if not (
+                    entry.name.startswith(f"{endpoint}_")
+                    and entry.name.endswith(".json")
+                ):
+                    continue
+                try:
+                    if entry.stat().st_mtime < cutoff:
+                        os.unlink(entry.path)
+                except OSError:
+                    continue
+    except OSError:
+        pass
+
+
+def _save_cached_payload(cache_path: Path, payload: Dict[str, Any]) -> None:
+    # Dates are stored as their str() form, which is how the CSV writer
+    # renders them anyway.
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(
+            dir=cache_path.parent, prefix=f"{cache_path.name}.", suffix=".tmp"
+        )
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, "w") as handle:
+            json.dump(payload, handle, default=str)
+        os.replace(tmp_name, cache_path)
+    except (OSError, TypeError, ValueError):
+        Path(tmp_name).unlink(missing_ok=True)
@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import csv
+import io
+from collections import ChainMap
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from yapcli.accounts import DiscoveredAccount
+from yapcli.utils import safe_filename_component
+
+# Rows of one payload keyed by account_id; None when the payload has no row list.
+_RowsByAccount = Optional[Dict[str, List[Dict[str, Any]]]]
+
+
+def flatten_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten nested dicts into dot-joined columns, like pd.json_normalize.
+
+    As with json_normalize, the top-level scalar fields come first and the
+    flattened nested fields follow them.
+    """
+
+    flat = {key: value for key, value in record.items() if not isinstance(value, dict)}
+    nested = ((key, value) for key, value in record.items() if isinstance(value, dict))
+    # Walk nested dicts with an explicit stack of iterators instead of
+    # recursing; resuming the parent iterator keeps the column order.
+    stack: List[Tuple[str, Iterator[Tuple[str, Any]]]] = [("", nested)]
+    while stack:
+        prefix, items = stack[-1]
+        for key, value in items:
+            if isinstance(value, dict):
+                stack.append((f"{prefix}{key}.", iter(value.items())))
+                break
+            flat[f"{prefix}{key}"] = value
+        else:
+            stack.pop()
+    return flat
+
+
+def write_records_csv(
+    records: Any,
+    out_path: Path,
+    *,
+    institution_id: str,
+    account: Optional[DiscoveredAccount] = None,
+) -> None:
+    """Write ``records`` (a list of dicts, or one dict) to ``out_path`` as CSV.
+
+    Columns are institution_id (and account_id) first, then the flattened
+    record fields, then the account metadata.
+    """
+
+    write_account_groups_csv(
+        [(account, records)], out_path, institution_id=institution_id
+    )
+
+
+def write_account_groups_csv(
+    groups: Sequence[Tuple[Optional[DiscoveredAccount], Any]],
+    out_path: Path,
+    *,
+    institution_id: str,
+) -> None:
+    """Write several accounts' records to one CSV at ``out_path``.
+
+    ``groups`` pairs each account (or None for untagged records) with its
+    records; every row carries the metadata of the account it came from.
+    """
+
+    columns: Dict[str, None] = {}
+    trailing: Dict[str, None] = {}
+    tagged_rows: List[Tuple[Dict[str, Any], Dict[str, Any]]] = []
+    for account, records in groups:
+        tags = _account_tags(institution_id, account)
+        trailing.update(dict.fromkeys(tags))
+        for record in records if isinstance(records, list) else [records]:
+            if not isinstance(record, dict):
+                continue
+            flat = flatten_record(record)
+            columns.update(dict.fromkeys(flat))
+            tagged_rows.append((tags, flat))
+
+    # Place the tag columns the way the pandas writer did: institution_id and
+    # account_id are inserted up front unless a record already has them, and
+    # the account metadata is appended.
+    fieldnames = list(columns)
+    if "institution_id" not in columns:
+        fieldnames.insert(0, "institution_id")
+    if "account_id" in trailing and "account_id" not in columns:
+        fieldnames.insert(1, "account_id")
+    fieldnames.extend(key for key in trailing if key not in fieldnames)
+
+    # The tag columns are shared by every row of an account; layer them over
+    # each record instead of copying them in.
+    write_csv(
+        out_path,
+        fieldnames=fieldnames,
+        rows=[ChainMap(tags, flat) for tags, flat in tagged_rows],
+    )
+
+
+def write_account_csvs(
+    accounts: Sequence[DiscoveredAccount],
+    payload_by_institution: Mapping[str, Dict[str, Any]],
+    *,
+    group_rows: Callable[[Dict[str, Any]], _RowsByAccount],
+    out_dir: Path,
+    timestamp: str,
+    combined: bool = False,
+) -> List[Path]:
+    """Write each account's rows from its institution's payload; return the paths.
+
+    ``group_rows`` splits a payload's rows by account_id, or returns None when
+    the payload has no row list (e.g. an error), in which case the payload
+    itself is written. Files are named ``<institution>_<mask>_<timestamp>.csv``,
+    or with ``combined`` one ``<institution>_<timestamp>.csv`` per institution.
+    """
+
+    # Group each payload's rows by account once, not once per selected account.
+    rows_by_institution = {
+        institution_id: group_rows(payload)
+        for institution_id, payload in payload_by_institution.items()
+    }
+
+    if combined:
+        accounts_by_institution: Dict[str, List[DiscoveredAccount]] = {}
+        for account in accounts:
+            accounts_by_institution.setdefault(account.institution_id, []).append(
+                account
+            )
+        combined_paths: List[Path] = []
+        for institution_id, institution_accounts in accounts_by_institution.items():
+            rows_by_account = rows_by_institution[institution_id]
+            # A payload without rows is written once, not once per account.
+            groups: List[Tuple[Optional[DiscoveredAccount], Any]] = (
+                [(None, payload_by_institution[institution_id])]
+                if rows_by_account is None
+                else [
+                    (account, rows_by_account.get(account.account_id, []))
+                    for account in institution_accounts
+                ]
+            )
+            out_path = (
+                out_dir / f"{safe_filename_component(institution_id)}_{timestamp}.csv"
+            )
+            write_account_groups_csv(groups, out_path, institution_id=institution_id)
+            combined_paths.append(out_path)
+        return combined_paths
+
+    paths: List[Path] = []
+    for account in accounts:
+        rows_by_account = rows_by_institution[account.institution_id]
+        records: Any = (
+            payload_by_institution[account.institution_id]
+            if rows_by_account is None
+            else rows_by_account.get(account.account_id, [])
+        )
+        inst_component = safe_filename_component(account.institution_id)
+        account_component = safe_filename_component(account.mask or account.account_id)
+        out_path = out_dir / f"{inst_component}_{account_component}_{timestamp}.csv"
+        write_records_csv(
+            records, out_path, institution_id=account.institution_id, account=account
+        )
+        paths.append(out_path)
+    return paths
+
+
+def _account_tags(
+    institution_id: str, account: Optional[DiscoveredAccount]
+) -> Dict[str, Any]:
+    if account is None:
+        return {"institution_id": institution_id}
+    return {
+        "institution_id": institution_id,
+        "account_id": account.account_id,
+        "account_type": account.type,
+        "account_name": account.name,
+        "account_subtype": account.subtype,
+        "account_mask": account.mask,
+        "bank_name": account.bank_name,
+    }
+
+
+def write_csv(
+    out_path: Path, *, fieldnames: List[str], rows: Sequence[Mapping[str, Any]]
+) -> None:
+    """Write a CSV with a header row to ``out_path`` in a single write.
+
+    The CSV is rendered in memory first so slow (e.g. network-mounted) output
+    directories see one large write instead of one per row. Integers in
+    columns that pandas would have read as float64 are written as floats, so
+    the output matches the former DataFrame.to_csv exports.
+    """
+
+    float_columns = _float_columns(fieldnames, rows)
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames, lineterminator="\n")
+    writer.writeheader()
+    if not float_columns:
+        writer.writerows(rows)
+    else:
+        for row in rows:
+            writer.writerow(
+                {
+                    **row,
+                    **{
+                        column: float(row[column])
+                        for column in float_columns
+                        if _is_int(row.get(column))
+                    },
+                }
+            )
+    out_path.write_bytes(buffer.getvalue().encode("utf-8"))
+
+
+def _is_int(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _float_columns(
+    fieldnames: Sequence[str], rows: Sequence[Mapping[str, Any]]
+) -> List[str]:
+    """Return the numeric columns that mix ints with floats or missing values.
+
+    pandas stores such a column as float64, so 3 was exported as ``3.0``.
+    """
+
+    float_columns: List[str] = []
+    for column in fieldnames:
+        values = [row.get(column) for row in rows]
+        present = [value for value in values if value is not None]
+        ints = sum(1 for value in present if _is_int(value))
+        floats = sum(1 for value in present if isinstance(value, float))
+        if ints and ints + floats == len(present) and (floats or None in values):
+            float_columns.append(column)
+    return float_columns
+
+
+def group_rows_by_account(items: Any) -> _RowsByAccount:
+    """Group the dict rows of ``items`` by their ``account_id`` in one pass.
+
+    Returns None when ``items`` is not a list so callers can fall back to
+    flattening the whole payload.
+    """
+
+    if not isinstance(items, list):
+        return None
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    for row in items:
+        if isinstance(row, dict) and isinstance(
+            account_id := row.get("account_id"), str
+        ):
+            groups.setdefault(account_id, []).append(row)
+    return groups
@@ -2,18 +2,14 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-import pandas as pd
 import typer
 
-from yapcli.accounts import DiscoveredAccount, resolve_target_accounts
+from yapcli.accounts import resolve_target_accounts
+from yapcli.cli.fetch import HOLDINGS_ENDPOINT, cached_payload, fetch_per_institution
+from yapcli.cli.frames import group_rows_by_account, write_account_csvs
 from yapcli.secrets import load_credentials
 from yapcli.server import PlaidBackend
-from yapcli.utils import (
-    default_output_dir,
-    default_secrets_dir,
-    safe_filename_component,
-    timestamp_for_filename,
-)
+from yapcli.utils import default_output_dir, default_secrets_dir, timestamp_for_filename
 
 app = typer.Typer(help="Fetch investment holdings for one or more accounts.")
 
@@ -25,49 +21,22 @@ def get_holdings_for_institution(
     """Initialize PlaidBackend from secrets and return /holdings response dict."""
 
     item_id, access_token = load_credentials(institution_id=institution_id)
-    backend = PlaidBackend(access_token=access_token, item_id=item_id)
-    return backend.get_holdings()
+    return cached_payload(
+        HOLDINGS_ENDPOINT,
+        key=(item_id,),
+        fetch=lambda: PlaidBackend(
+            access_token=access_token, item_id=item_id
+        ).get_holdings(),
+    )
 
 
-def _payload_to_dataframe(
-    *,
+def _holdings_by_account(
     payload: Dict[str, Any],
-    institution_id: str,
-    account: DiscoveredAccount,
-) -> pd.DataFrame:
+) -> Optional[Dict[str, List[Dict[str, Any]]]]:
     inner = payload.get("holdings") if isinstance(payload, dict) else None
-    holdings_list: Any = None
-    if isinstance(inner, dict):
-        holdings_list = inner.get("holdings")
-
-    rows: List[Dict[str, Any]]
-    if isinstance(holdings_list, list):
-        rows = [
-            cast_row
-            for cast_row in holdings_list
-            if isinstance(cast_row, dict)
-            and cast_row.get("account_id") == account.account_id
-        ]
-        frame = pd.json_normalize(rows)
-    else:
-        frame = pd.json_normalize(payload)
-
-    if "institution_id" not in frame.columns:
-        frame.insert(0, "institution_id", institution_id)
-    else:
-        frame["institution_id"] = institution_id
-
-    if "account_id" not in frame.columns:
-        frame.insert(1, "account_id", account.account_id)
-    else:
-        frame["account_id"] = account.account_id
-
-    frame["account_type"] = account.type
-    frame["account_name"] = account.name
-    frame["account_subtype"] = account.subtype
-    frame["account_mask"] = account.mask
-    frame["bank_name"] = account.bank_name
-    return frame
+    return group_rows_by_account(
+        inner.get("holdings") if isinstance(inner, dict) else None
+    )
 
 
 @app.command("holdings")
@@ -93,6 +62,11 @@ def get_holdings(
         file_okay=False,
         dir_okay=True,
     ),
+    combined: bool = typer.Option(
+        False,
+        "--combined",
+        help="Write one CSV per institution (covering all selected accounts) instead of one per account.",
+    ),
 ) -> None:
     """Fetch holdings for one or more eligible accounts and write CSV(s)."""
 
@@ -109,30 +83,17 @@ def get_holdings(
     holdings_out_dir.mkdir(parents=True, exist_ok=True)
 
     timestamp = timestamp_for_filename()
-    payload_by_institution: Dict[str, Dict[str, Any]] = {}
-
-    for account in selected_accounts:
-        if account.institution_id not in payload_by_institution:
-            try:
-                payload_by_institution[account.institution_id] = (
-                    get_holdings_for_institution(
-                        institution_id=account.institution_id,
-                    )
-                )
-            except (FileNotFoundError, ValueError) as exc:
-                payload_by_institution[account.institution_id] = {"error": str(exc)}
-
-        payload = payload_by_institution[account.institution_id]
-        frame = _payload_to_dataframe(
-            payload=payload,
-            institution_id=account.institution_id,
-            account=account,
-        )
+    payload_by_institution = fetch_per_institution(
+        lambda inst: get_holdings_for_institution(institution_id=inst),
+        (account.institution_id for account in selected_accounts),
+    )
 
-        inst_component = safe_filename_component(account.institution_id)
-        account_component = safe_filename_component(account.mask or account.account_id)
-        out_path = (
-            holdings_out_dir / f"{inst_component}_{account_component}_{timestamp}.csv"
-        )
-        frame.to_csv(out_path, index=False)
+    for out_path in write_account_csvs(
+        selected_accounts,
+        payload_by_institution,
+        group_rows=_holdings_by_account,
+        out_dir=holdings_out_dir,
+        timestamp=timestamp,
+        combined=combined,
+    ):
         typer.echo(str(out_path))
@@ -3,18 +3,18 @@ import datetime as dt
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-import pandas as pd
 import typer
 
-from yapcli.accounts import DiscoveredAccount, resolve_target_accounts
+from yapcli.accounts import resolve_target_accounts
+from yapcli.cli.fetch import (
+    INVESTMENTS_TRANSACTIONS_ENDPOINT,
+    cached_payload,
+    fetch_per_institution,
+)
+from yapcli.cli.frames import group_rows_by_account, write_account_csvs
 from yapcli.secrets import load_credentials
 from yapcli.server import PlaidBackend
-from yapcli.utils import (
-    default_output_dir,
-    default_secrets_dir,
-    safe_filename_component,
-    timestamp_for_filename,
-)
+from yapcli.utils import default_output_dir, default_secrets_dir, timestamp_for_filename
 
 app = typer.Typer(help="Fetch investment transactions for one or more accounts.")
 
@@ -28,56 +28,29 @@ def get_investments_transactions_for_institution(
     """Initialize PlaidBackend from secrets and return /investments_transactions response dict."""
 
     item_id, access_token = load_credentials(institution_id=institution_id)
-    backend = PlaidBackend(access_token=access_token, item_id=item_id)
     request_kwargs: Dict[str, Any] = {}
     if start_date is not None:
         request_kwargs["start_date"] = start_date
     if end_date is not None:
         request_kwargs["end_date"] = end_date
-    return backend.get_investments_transactions(**request_kwargs)
+    return cached_payload(
+        INVESTMENTS_TRANSACTIONS_ENDPOINT,
+        key=(item_id, start_date, end_date),
+        fetch=lambda: PlaidBackend(
+            access_token=access_token, item_id=item_id
+        ).get_investments_transactions(**request_kwargs),
+    )
 
 
-def _payload_to_dataframe(
-    *,
+def _transactions_by_account(
     payload: Dict[str, Any],
-    institution_id: str,
-    account: DiscoveredAccount,
-) -> pd.DataFrame:
+) -> Optional[Dict[str, List[Dict[str, Any]]]]:
     inner = (
         payload.get("investments_transactions") if isinstance(payload, dict) else None
     )
-    txns_list: Any = None
-    if isinstance(inner, dict):
-        txns_list = inner.get("investment_transactions")
-
-    rows: List[Dict[str, Any]]
-    if isinstance(txns_list, list):
-        rows = [
-            cast_row
-            for cast_row in txns_list
-            if isinstance(cast_row, dict)
-            and cast_row.get("account_id") == account.account_id
-        ]
-        frame = pd.json_normalize(rows)
-    else:
-        frame = pd.json_normalize(payload)
-
-    if "institution_id" not in frame.columns:
-        frame.insert(0, "institution_id", institution_id)
-    else:
-        frame["institution_id"] = institution_id
-
-    if "account_id" not in frame.columns:
-        frame.insert(1, "account_id", account.account_id)
-    else:
-        frame["account_id"] = account.account_id
-
-    frame["account_type"] = account.type
-    frame["account_name"] = account.name
-    frame["account_subtype"] = account.subtype
-    frame["account_mask"] = account.mask
-    frame["bank_name"] = account.bank_name
-    return frame
+    return group_rows_by_account(
+        inner.get("investment_transactions") if isinstance(inner, dict) else None
+    )
 
 
 @app.command("investment_transactions")
@@ -103,6 +76,11 @@ def get_investment_transactions(
         file_okay=False,
         dir_okay=True,
     ),
+    combined: bool = typer.Option(
+        False,
+        "--combined",
+        help="Write one CSV per institution (covering all selected accounts) instead of one per account.",
+    ),
     start_date: Optional[str] = typer.Option(
         None,
         "--start_date",
@@ -151,30 +129,21 @@ def get_investment_transactions(
     out_base.mkdir(parents=True, exist_ok=True)
 
     timestamp = timestamp_for_filename()
-    payload_by_institution: Dict[str, Dict[str, Any]] = {}
-
-    for account in selected_accounts:
-        if account.institution_id not in payload_by_institution:
-            try:
-                payload_by_institution[account.institution_id] = (
-                    get_investments_transactions_for_institution(
-                        institution_id=account.institution_id,
-                        start_date=parsed_start_date,
-                        end_date=parsed_end_date,
-                    )
-                )
-            except (FileNotFoundError, ValueError) as exc:
-                payload_by_institution[account.institution_id] = {"error": str(exc)}
-
-        payload = payload_by_institution[account.institution_id]
-        frame = _payload_to_dataframe(
-            payload=payload,
-            institution_id=account.institution_id,
-            account=account,
-        )
-
-        inst_component = safe_filename_component(account.institution_id)
-        account_component = safe_filename_component(account.mask or account.account_id)
-        out_path = out_base / f"{inst_component}_{account_component}_{timestamp}.csv"
-        frame.to_csv(out_path, index=False)
+    payload_by_institution = fetch_per_institution(
+        lambda inst: get_investments_transactions_for_institution(
+            institution_id=inst,
+            start_date=parsed_start_date,
+            end_date=parsed_end_date,
+        ),
+        (account.institution_id for account in selected_accounts),
+    )
+
+    for out_path in write_account_csvs(
+        selected_accounts,
+        payload_by_institution,
+        group_rows=_transactions_by_account,
+        out_dir=out_base,
+        timestamp=timestamp,
+        combined=combined,
+    ):
         typer.echo(str(out_path))
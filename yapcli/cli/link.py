@@ -1,37 +1,46 @@
 from __future__ import annotations
 
+import contextlib
 import datetime as dt
+import functools
 import os
+import selectors
 import signal
 import subprocess
 import sys
+import tempfile
 import time
 import webbrowser
 from dataclasses import dataclass
 from pathlib import Path
-from typing import IO, Optional, Tuple
+from typing import IO, Callable, Dict, Iterator, List, Optional, Tuple, Union
 
 import typer
 from loguru import logger
 from rich.console import Console
 
+from yapcli.accounts import ACCOUNT_INDEX_PREFIX
+from yapcli.cli.fetch import FETCH_CACHE_PREFIXES
 from yapcli.institutions import discover_institutions, prompt_for_institutions
 from yapcli.logging import build_log_path
-from yapcli.utils import default_log_dir, default_secrets_dir
+from yapcli.secrets import clear_credentials_cache, secrets_dir_fingerprint
+from yapcli.utils import default_cache_dir, default_log_dir, default_secrets_dir
 
 console = Console()
 app = typer.Typer(help="Run Plaid Link locally and capture the resulting tokens.")
 
 
+@functools.lru_cache(maxsize=1)
 def _get_frontend_dir() -> Path:
-    """Get the packaged frontend directory containing bundled build assets."""
-    yapcli_package_dir = Path(__file__).resolve().parent.parent
+    """Get the packaged frontend directory containing bundled build assets.
 
-    # Otherwise try package-relative path (installed package)
-    packaged_frontend = yapcli_package_dir / "frontend" / "build"
+    The location is resolved once per process; a missing build raises and is
+    looked up again on the next call.
+    """
+    frontend_dir = Path(__file__).resolve().parent.parent / "frontend"
 
-    if packaged_frontend.exists():
-        return packaged_frontend.parent
+    if (frontend_dir / "build").exists():
+        return frontend_dir
 
     # No frontend found
     raise FileNotFoundError(
@@ -42,25 +51,25 @@ def _get_frontend_dir() -> Path:
 
 DEFAULT_BACKEND_PORT = 8000
 DEFAULT_FRONTEND_PORT = 3000
-POLL_INTERVAL_SECONDS = 2.0
-STARTED_AT_TOLERANCE_SECONDS = 1.0
-_ALLOWED_PRODUCTS = {"transactions", "investments"}
+POLL_INTERVAL_SECONDS = 0.25
+_ALLOWED_PRODUCTS = frozenset({"transactions", "investments"})
 
 
 def _validate_products(value: Optional[str]) -> Optional[str]:
     if value is None:
         return None
 
-    raw = value.strip()
-    if raw == "":
-        return None
-
-    parts = [p.strip().lower() for p in raw.split(",")]
-    parts = [p for p in parts if p]
-    if not parts:
-        return None
+    parts: list[str] = []
+    invalid: dict[str, None] = {}
+    for token in value.split(","):
+        product = token.strip().lower()
+        if not product:
+            continue
+        if product in _ALLOWED_PRODUCTS:
+            parts.append(product)
+        else:
+            invalid[product] = None
 
-    invalid = sorted({p for p in parts if p not in _ALLOWED_PRODUCTS})
     if invalid:
         allowed = ", ".join(sorted(_ALLOWED_PRODUCTS))
         bad = ", ".join(invalid)
@@ -68,6 +77,8 @@ def _validate_products(value: Optional[str]) -> Optional[str]:
             f"Invalid --products value(s): {bad}. Allowed values: {allowed}"
         )
 
+    if not parts:
+        return None
     return ",".join(parts)
 
 
@@ -209,40 +220,113 @@ def terminate_process(proc: Optional[ManagedProcess]) -> None:
         proc.log_handle.close()
 
 
+def secrets_dir_now(secrets_dir: Path) -> float:
+    """Return the current time as recorded by the filesystem holding secrets_dir.
+
+    Filesystems may store mtimes at a coarse resolution (e.g. 1s) or from a
+    clock that lags time.time(); the mtime of a freshly created file has the
+    same resolution and clock as the tokens the backend will write.
+    """
+
+    secrets_dir.mkdir(parents=True, exist_ok=True)
+    try:
+        with tempfile.TemporaryFile(dir=secrets_dir) as probe:
+            return os.fstat(probe.fileno()).st_mtime
+    except OSError:
+        # Assume the coarsest common resolution.
+        return float(int(time.time()))
+
+
 def discover_credentials(
     secrets_dir: Path, started_at: float
 ) -> Optional[Tuple[str, str, str]]:
-    best: Optional[Tuple[str, str, str]] = None
-    best_updated = -1.0
+    access_updated: Dict[str, float] = {}
+    item_updated: Dict[str, float] = {}
+    # One scandir pass collects every mtime; only the winning pair is read.
+    try:
+        with os.scandir(secrets_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                if name.endswith("_access_token"):
+                    mtimes = access_updated
+                    identifier = name[: -len("_access_token")]
+                elif name.endswith("_item_id"):
+                    mtimes = item_updated
+                    identifier = name[: -len("_item_id")]
+                else:
+                    continue
+                try:
+                    if entry.is_file():
+                        mtimes[identifier] = entry.stat().st_mtime
+                except FileNotFoundError:
+                    continue
+    except FileNotFoundError:
+        return None
 
-    for access_file in secrets_dir.glob("*_access_token"):
-        identifier = access_file.name[: -len("_access_token")]
-        item_file = secrets_dir / f"{identifier}_item_id"
-        if not item_file.exists():
+    # started_at should come from secrets_dir_now() so it shares the mtimes'
+    # clock and resolution; the comparison is then exact.
+    best_identifier: Optional[str] = None
+    best_updated = -1.0
+    for identifier, access_mtime in access_updated.items():
+        item_mtime = item_updated.get(identifier)
+        if item_mtime is None or access_mtime < started_at or item_mtime < started_at:
             continue
+        updated = max(access_mtime, item_mtime)
+        if updated >= best_updated:
+            best_identifier = identifier
+            best_updated = updated
 
-        try:
-            access_updated = access_file.stat().st_mtime
-            item_updated = item_file.stat().st_mtime
-        except FileNotFoundError:
-            continue
+    if best_identifier is None:
+        return None
+    try:
+        item_id = (secrets_dir / f"{best_identifier}_item_id").read_text().strip()
+        access_token = (
+            (secrets_dir / f"{best_identifier}_access_token").read_text().strip()
+        )
+    except FileNotFoundError:
+        return None
+    return (best_identifier, item_id, access_token)
 
-        # Some filesystems have coarse mtime resolution (e.g. 1s). If we compare
-        # strictly against a high-resolution started_at, we can miss files that
-        # were written shortly after started_at but recorded with an earlier-
-        # rounded mtime.
-        cutoff = started_at - STARTED_AT_TOLERANCE_SECONDS
-        if access_updated < cutoff or item_updated < cutoff:
-            continue
 
-        updated = max(access_updated, item_updated)
-        if updated >= best_updated:
-            item_id = item_file.read_text().strip()
-            access_token = access_file.read_text().strip()
-            best = (identifier, item_id, access_token)
-            best_updated = updated
+@contextlib.contextmanager
+def _process_exit_waiter(
+    processes: List[subprocess.Popen],
+) -> Iterator[Callable[[float], bool]]:
+    """Yield ``wait(timeout)``, which returns early once any process exits.
 
-    return best
+    On Linux each process gets a pidfd, so an exit wakes the wait at once and
+    wait() reports whether one happened. Elsewhere (or when a pidfd cannot be
+    opened) it sleeps for the timeout and always reports a possible exit.
+    """
+
+    selector: Optional[selectors.BaseSelector] = None
+    pidfds: List[int] = []
+    try:
+        if processes and hasattr(os, "pidfd_open"):
+            selector = selectors.DefaultSelector()
+            for process in processes:
+                pidfd = os.pidfd_open(process.pid)
+                pidfds.append(pidfd)
+                selector.register(pidfd, selectors.EVENT_READ)
+    except OSError:
+        # Already reaped, or the kernel lacks pidfd support: fall back to sleeping.
+        if selector is not None:
+            selector.close()
+        selector = None
+
+    def wait(timeout: float) -> bool:
+        if selector is None:
+            time.sleep(timeout)
+            return True
+        return bool(selector.select(timeout))
+
+    try:
+        yield wait
+    finally:
+        if selector is not None:
+            selector.close()
+        for pidfd in pidfds:
+            os.close(pidfd)
 
 
 def wait_for_credentials(
@@ -252,49 +336,106 @@ def wait_for_credentials(
     timeout: int,
     backend_proc: Optional[ManagedProcess],
     frontend_proc: Optional[ManagedProcess],
+    written_after: Optional[float] = None,
 ) -> Tuple[str, str, str]:
+    """Wait for a credentials pair written at or after ``written_after``.
+
+    ``written_after`` defaults to secrets_dir_now() at the start of the wait;
+    pass a value taken before the backend started to include earlier writes.
+    """
+
     deadline = started_at + timeout
-    secrets_dir.mkdir(parents=True, exist_ok=True)
+    if written_after is None:
+        written_after = secrets_dir_now(secrets_dir)
+    else:
+        secrets_dir.mkdir(parents=True, exist_ok=True)
+
+    processes = [
+        proc.process for proc in (backend_proc, frontend_proc) if proc is not None
+    ]
+    # Polling only stats the directory; the secrets are re-scanned and read
+    # when a file was written, so a short interval stays cheap.
+    last_fingerprint: Optional[Tuple[Tuple[str, int], ...]] = None
+    may_have_exited = True
+    with _process_exit_waiter(processes) as wait:
+        while time.time() < deadline:
+            fingerprint = secrets_dir_fingerprint(secrets_dir)
+            if fingerprint != last_fingerprint:
+                last_fingerprint = fingerprint
+                credentials = discover_credentials(secrets_dir, written_after)
+                if credentials:
+                    return credentials
+
+            if may_have_exited:
+                if backend_proc and backend_proc.process.poll() is not None:
+                    raise RuntimeError(
+                        "Flask backend terminated before credentials were captured."
+                    )
+
+                if frontend_proc and frontend_proc.process.poll() is not None:
+                    raise RuntimeError(
+                        "Frontend server terminated before Plaid Link completed."
+                    )
+
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            may_have_exited = wait(min(POLL_INTERVAL_SECONDS, remaining))
 
-    while time.time() < deadline:
-        credentials = discover_credentials(secrets_dir, started_at)
-        if credentials:
-            return credentials
+    raise TimeoutError
 
-        if backend_proc and backend_proc.process.poll() is not None:
-            raise RuntimeError(
-                "Flask backend terminated before credentials were captured."
-            )
 
-        if frontend_proc and frontend_proc.process.poll() is not None:
-            raise RuntimeError(
-                "Frontend server terminated before Plaid Link completed."
-            )
+def _clear_secrets(*, secrets_dir: Path, prefix: str = "") -> int:
+    removed = _unlink_files(secrets_dir, prefix=prefix)
+    clear_credentials_cache()
+    return removed
 
-        remaining = deadline - time.time()
-        if remaining <= 0:
-            break
-        time.sleep(min(POLL_INTERVAL_SECONDS, remaining))
 
-    raise TimeoutError
+def _clear_cache(*, cache_dir: Path) -> int:
+    """Delete yapcli's fetched payloads and account index from ``cache_dir``.
+
+    Other files and subdirectories (e.g. the sandbox cache) are left alone, as
+    ``YAPCLI_CACHE_DIR`` may point at a directory shared with other tools.
+    """
 
+    try:
+        return _unlink_files(
+            cache_dir,
+            prefix=(ACCOUNT_INDEX_PREFIX, *FETCH_CACHE_PREFIXES),
+            suffix=".json",
+        )
+    except FileNotFoundError:
+        return 0
 
-def _clear_institution_secrets(*, secrets_dir: Path, institution_id: str) -> int:
+
+def _unlink_files(
+    directory: Path, *, prefix: Union[str, Tuple[str, ...]] = "", suffix: str = ""
+) -> int:
     removed = 0
-    for path in secrets_dir.glob(f"{institution_id}_*"):
-        if path.is_file():
-            path.unlink(missing_ok=True)
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            # is_file() is answered from the directory listing for regular
+            # files, so this costs no stat() per entry.
+            if (
+                not entry.name.startswith(prefix)
+                or not entry.name.endswith(suffix)
+                or not entry.is_file()
+            ):
+                continue
+            try:
+                os.unlink(entry.path)
+            except FileNotFoundError:
+                continue
             removed += 1
     return removed
 
 
+def _clear_institution_secrets(*, secrets_dir: Path, institution_id: str) -> int:
+    return _clear_secrets(secrets_dir=secrets_dir, prefix=f"{institution_id}_")
+
+
 def _clear_all_secrets(*, secrets_dir: Path) -> int:
-    removed = 0
-    for path in secrets_dir.glob("*"):
-        if path.is_file():
-            path.unlink(missing_ok=True)
-            removed += 1
-    return removed
+    return _clear_secrets(secrets_dir=secrets_dir)
 
 
 @app.command()
@@ -355,7 +496,7 @@ def link(
     clear_all: bool = typer.Option(
         False,
         "--clear-all",
-        help="Clear all saved secrets.",
+        help="Clear all saved secrets and cached payloads.",
     ),
 ) -> None:
     """
@@ -395,6 +536,14 @@ def link(
                 removed,
                 secrets_path,
             )
+            cache_dir = default_cache_dir()
+            removed_cached = _clear_cache(cache_dir=cache_dir)
+            console.print(
+                f"[green]Cleared[/] {removed_cached} cached file(s) from {cache_dir}."
+            )
+            logger.info(
+                "Cleared cache (count={}, cache_dir={})", removed_cached, cache_dir
+            )
             return
 
         selected_ids: list[str]
@@ -433,6 +582,9 @@ def link(
 
     started_at = time.time()
     started_dt = dt.datetime.fromtimestamp(started_at)
+    # Tokens from this run are the ones written after this point, as the
+    # secrets filesystem measures it.
+    written_after = secrets_dir_now(secrets_path)
     # Logging is configured once in the main Typer app callback.
 
     log_dir = default_log_dir()
@@ -509,6 +661,7 @@ def link(
             timeout=timeout,
             backend_proc=backend_proc,
             frontend_proc=frontend_proc,
+            written_after=written_after,
         )
 
         console.print("[green]Plaid Link completed.[/]")
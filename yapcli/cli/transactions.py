@@ -5,10 +5,10 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional
 import re
 
-import pandas as pd
 import typer
 
 from yapcli.accounts import DiscoveredAccount, resolve_target_accounts
+from yapcli.cli.frames import write_records_csv
 from yapcli.secrets import load_credentials
 from yapcli.server import PlaidBackend
 from yapcli.utils import (
@@ -145,47 +145,10 @@ def get_transactions_for_institution(
     return backend.get_transactions(**request_kwargs)
 
 
-def _payload_to_dataframe(
-    *,
-    payload: Dict[str, Any],
-    institution_id: str,
-    account: Optional[DiscoveredAccount] = None,
-) -> pd.DataFrame:
+def _transaction_records(payload: Dict[str, Any]) -> Any:
+    # Without a transactions list (e.g. an error payload) write the payload itself.
     transactions = payload.get("transactions")
-    if isinstance(transactions, list):
-        frame = pd.json_normalize(transactions)
-        if "institution_id" not in frame.columns:
-            frame.insert(0, "institution_id", institution_id)
-        else:
-            frame["institution_id"] = institution_id
-        if account is not None:
-            if "account_id" not in frame.columns:
-                frame.insert(1, "account_id", account.account_id)
-            else:
-                frame["account_id"] = account.account_id
-            frame["account_type"] = account.type
-            frame["account_name"] = account.name
-            frame["account_subtype"] = account.subtype
-            frame["account_mask"] = account.mask
-            frame["bank_name"] = account.bank_name
-        return frame
-
-    frame = pd.json_normalize(payload)
-    if "institution_id" not in frame.columns:
-        frame.insert(0, "institution_id", institution_id)
-    else:
-        frame["institution_id"] = institution_id
-    if account is not None:
-        if "account_id" not in frame.columns:
-            frame.insert(1, "account_id", account.account_id)
-        else:
-            frame["account_id"] = account.account_id
-        frame["account_type"] = account.type
-        frame["account_name"] = account.name
-        frame["account_subtype"] = account.subtype
-        frame["account_mask"] = account.mask
-        frame["bank_name"] = account.bank_name
-    return frame
+    return transactions if isinstance(transactions, list) else payload
 
 
 @app.command("transactions")
@@ -307,12 +270,6 @@ def get_transactions(
                 )
 
         # Format and save added transactions
-        frame = _payload_to_dataframe(
-            payload=payload,
-            institution_id=account.institution_id,
-            account=account,
-        )
-
         out_path = build_transactions_csv_path(
             out_dir=transactions_out_dir,
             account=account,
@@ -320,7 +277,12 @@ def get_transactions(
             kind="transactions",
         )
         out_path.parent.mkdir(parents=True, exist_ok=True)
-        frame.to_csv(out_path, index=False)
+        write_records_csv(
+            _transaction_records(payload),
+            out_path,
+            institution_id=account.institution_id,
+            account=account,
+        )
         typer.echo(str(out_path))
 
         meta_path = build_transactions_meta_path(
@@ -357,11 +319,6 @@ def get_transactions(
             )
 
         if isinstance(modified, list) and modified:
-            modified_frame = _payload_to_dataframe(
-                payload={"transactions": modified},
-                institution_id=account.institution_id,
-                account=account,
-            )
             modified_path = build_transactions_csv_path(
                 out_dir=transactions_out_dir,
                 account=account,
@@ -369,15 +326,15 @@ def get_transactions(
                 kind="modified",
             )
             modified_path.parent.mkdir(parents=True, exist_ok=True)
-            modified_frame.to_csv(modified_path, index=False)
-            typer.echo(str(modified_path))
-
-        if isinstance(removed, list) and removed:
-            removed_frame = _payload_to_dataframe(
-                payload={"transactions": removed},
+            write_records_csv(
+                modified,
+                modified_path,
                 institution_id=account.institution_id,
                 account=account,
             )
+            typer.echo(str(modified_path))
+
+        if isinstance(removed, list) and removed:
             removed_path = build_transactions_csv_path(
                 out_dir=transactions_out_dir,
                 account=account,
@@ -385,5 +342,10 @@ def get_transactions(
                 kind="removed",
             )
             removed_path.parent.mkdir(parents=True, exist_ok=True)
-            removed_frame.to_csv(removed_path, index=False)
+            write_records_csv(
+                removed,
+                removed_path,
+                institution_id=account.institution_id,
+                account=account,
+            )
             typer.echo(str(removed_path))
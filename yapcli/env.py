@@ -12,6 +12,10 @@ _APP_NAME = "yapcli"
 _PLATFORM_DIRS = PlatformDirs(appname=_APP_NAME)
 
 _LOADED_ENV_FILES: list[Path] = []
+_ENV_FILES_LOADED = False
+
+# Set to a truthy value to skip loading .env files on package import (e.g. in tests).
+SKIP_DOTENV_ENV_VAR = "YAPCLI_SKIP_DOTENV"
 
 # All environment variables consumed by yapcli at runtime.
 # Keep this list as the single source of truth for config key ordering and
@@ -26,10 +30,13 @@ CONSUMED_ENV_VARS: tuple[str, ...] = (
     "PLAID_SECRETS_DIR",
     "YAPCLI_DEFAULT_DIRS",
     "YAPCLI_LOG_DIR",
+    "YAPCLI_CACHE_DIR",
+    "YAPCLI_FETCH_CACHE_TTL_SECONDS",
     "YAPCLI_OUTPUT_DIR",
     "YAPCLI_LOG_LEVEL",
     "YAPCLI_PLAID_TIMEOUT_SECONDS",
     "YAPCLI_DAYS_REQUESTED",
+    "YAPCLI_SIMPLE_PROMPTS",
 )
 _CONSUMED_ENV_VARS_SET = set(CONSUMED_ENV_VARS)
 
@@ -104,7 +111,7 @@ def _read_env_file(path: Path) -> Dict[str, str]:
     return {k: v for k, v in parsed.items() if k is not None and v is not None}
 
 
-def load_env_files() -> Iterable[Path]:
+def load_env_files(*, force: bool = False) -> Iterable[Path]:
     """Load env vars from both platform and CWD .env files.
 
     Precedence (highest to lowest):
@@ -112,12 +119,19 @@ def load_env_files() -> Iterable[Path]:
     2. CWD .env
     3. platformdirs user_config .env
 
+    Files are only read once per process unless force=True.
+
     Returns an iterable of paths that were attempted in load order.
     """
 
+    global _ENV_FILES_LOADED
+
     platform_path = platform_env_file_path()
     cwd_path = cwd_env_file_path()
 
+    if _ENV_FILES_LOADED and not force:
+        return (platform_path, cwd_path)
+
     _LOADED_ENV_FILES.clear()
 
     # Capture what was already present so we never override a shell-provided value.
@@ -146,9 +160,24 @@ def load_env_files() -> Iterable[Path]:
         )
         _LOADED_ENV_FILES.append(cwd_path)
 
+    _ENV_FILES_LOADED = True
     return (platform_path, cwd_path)
 
 
+def load_default_env_files() -> bool:
+    """Load the default .env files unless YAPCLI_SKIP_DOTENV is truthy.
+
+    Returns True if the files have been loaded by this or an earlier call.
+    """
+
+    skip = os.environ.get(SKIP_DOTENV_ENV_VAR, "").strip().lower()
+    if skip in {"1", "true", "yes"}:
+        return False
+
+    load_env_files()
+    return True
+
+
 def loaded_env_file_paths() -> tuple[Path, ...]:
     """Return env files that were actually loaded (contained at least one value)."""
 
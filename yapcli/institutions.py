@@ -1,16 +1,18 @@
 from __future__ import annotations
 
+import functools
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional, Tuple
 
-import questionary
+from yapcli.secrets import read_secret_required, secrets_dir_fingerprint
+from yapcli.server import BackendConfig, PlaidBackend, plaid_settings_key
 
-from yapcli.secrets import read_secret_required
-from yapcli.server import PlaidBackend
+if TYPE_CHECKING:
+    import questionary
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DiscoveredInstitution:
     institution_id: str
     bank_name: Optional[str] = None
@@ -24,19 +26,47 @@ def discover_institutions(*, secrets_dir: Path) -> List[DiscoveredInstitution]:
 
     Bank name resolution uses PlaidBackend.get_item() and may return None if
     credentials are missing/invalid or Plaid is not configured.
+
+    Results are cached until a file in `secrets_dir` or the Plaid settings in
+    the environment change.
     """
 
-    identifiers: List[str] = []
-    for access_file in secrets_dir.glob("*_access_token"):
-        identifier = access_file.name[: -len("_access_token")]
-        if not identifier:
-            continue
-        item_file = secrets_dir / f"{identifier}_item_id"
-        if item_file.exists():
-            identifiers.append(identifier)
+    return list(
+        _discover_institutions_cached(
+            secrets_dir,
+            secrets_dir_fingerprint(secrets_dir),
+            plaid_settings_key(),
+        )
+    )
+
+
+def clear_institutions_cache() -> None:
+    """Forget results cached by discover_institutions()."""
+
+    _discover_institutions_cached.cache_clear()
+
+
+@functools.lru_cache(maxsize=8)
+def _discover_institutions_cached(
+    secrets_dir: Path,
+    fingerprint: Tuple[Tuple[str, int], ...],
+    _settings_key: Tuple[Optional[str], ...],
+) -> Tuple[DiscoveredInstitution, ...]:
+    # The fingerprint already lists every file in secrets_dir, so the
+    # directory is not scanned (or stat'ed per identifier) again here.
+    names = {name for name, _mtime in fingerprint}
+    suffix = "_access_token"
+    identifiers = sorted(
+        name[: -len(suffix)]
+        for name in names
+        if name.endswith(suffix)
+        and name != suffix
+        and f"{name[: -len(suffix)]}_item_id" in names
+    )
 
     results: List[DiscoveredInstitution] = []
-    for identifier in sorted(set(identifiers)):
+    config: Optional[BackendConfig] = None
+    for identifier in identifiers:
         try:
             access_token = read_secret_required(
                 secrets_dir / f"{identifier}_access_token", label="access_token"
@@ -51,7 +81,11 @@ def discover_institutions(*, secrets_dir: Path) -> List[DiscoveredInstitution]:
         bank_name: Optional[str] = None
         if access_token and item_id:
             try:
-                backend = PlaidBackend(access_token=access_token, item_id=item_id)
+                if config is None:
+                    config = BackendConfig.shared()
+                backend = PlaidBackend(
+                    access_token=access_token, item_id=item_id, config=config
+                )
                 payload = backend.get_item()
                 institution = (
                     payload.get("institution") if isinstance(payload, dict) else None
@@ -74,7 +108,7 @@ def discover_institutions(*, secrets_dir: Path) -> List[DiscoveredInstitution]:
             "Try running 'yapcli link' command first to save credentials."
         )
 
-    return results
+    return tuple(results)
 
 
 def prompt_for_institutions(
@@ -87,19 +121,23 @@ def prompt_for_institutions(
     if not available:
         raise ValueError("No saved institutions available")
 
-    choices: List[questionary.Choice] = []
-    for idx, entry in enumerate(available):
-        title_parts = [f"item_id={entry.institution_id}"]
-        if entry.bank_name:
-            title_parts.append(entry.bank_name)
-        title = " - ".join(title_parts)
-        choices.append(
-            questionary.Choice(
-                title=title,
-                value=entry.institution_id,
-                checked=(idx == 0),
-            )
+    # Imported lazily: questionary pulls in prompt_toolkit, which non-interactive
+    # runs never need.
+    import questionary
+
+    titles = [
+        (
+            f"item_id={entry.institution_id} - {entry.bank_name}"
+            if entry.bank_name
+            else f"item_id={entry.institution_id}"
         )
+        for entry in available
+    ]
+    choice = questionary.Choice
+    choices: List[questionary.Choice] = [
+        choice(title, entry.institution_id, checked=(idx == 0))
+        for idx, (title, entry) in enumerate(zip(titles, available))
+    ]
 
     try:
         selected = questionary.checkbox(
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import functools
+import os
+import tempfile
 from pathlib import Path
 from typing import Optional, Tuple
 
@@ -8,24 +11,72 @@ from yapcli.utils import default_secrets_dir
 SECRETS_DIR_ENV_VAR = "PLAID_SECRETS_DIR"
 
 
+_SECRET_READ_CHUNK = 4096
+
+
 def read_secret_required(path: Path, *, label: str) -> str:
+    # Secrets are tiny files; read raw bytes with os.read rather than going
+    # through Path.read_text's text-IO wrapper.
     try:
-        value = path.read_text().strip()
+        fd = os.open(path, os.O_RDONLY)
     except FileNotFoundError as exc:
         raise FileNotFoundError(f"Missing {label} file: {path}") from exc
 
+    try:
+        chunks = []
+        # A short read on a regular file means EOF, so a secret smaller than
+        # one chunk costs a single read() rather than an extra one to see b"".
+        while True:
+            chunk = os.read(fd, _SECRET_READ_CHUNK)
+            chunks.append(chunk)
+            if len(chunk) < _SECRET_READ_CHUNK:
+                break
+    finally:
+        os.close(fd)
+
+    value = b"".join(chunks).strip().decode("utf-8")
     if not value:
         raise ValueError(f"Empty {label} in file: {path}")
 
     return value
 
 
+def write_secret(path: Path, value: str) -> None:
+    """Atomically replace the secret at ``path`` with ``value``.
+
+    The value is written to a dotfile next to ``path`` and renamed into place,
+    so readers never see a truncated or half-written secret. mkstemp creates
+    the file owner-readable only.
+    """
+
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(value.encode("utf-8"))
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
 def load_credentials(
     *, institution_id: str, secrets_dir: Optional[Path] = None
 ) -> Tuple[str, str]:
-    """Load (item_id, access_token) for an institution_id from secrets files."""
+    """Load (item_id, access_token) for an institution_id from secrets files.
+
+    Results are cached per (institution_id, secrets dir) for the life of the
+    process; call clear_credentials_cache() after writing or removing secrets.
+    """
+
+    return _load_credentials_cached(
+        institution_id, secrets_dir or default_secrets_dir()
+    )
 
-    secrets_path = secrets_dir or default_secrets_dir()
+
+@functools.lru_cache(maxsize=128)
+def _load_credentials_cached(
+    institution_id: str, secrets_path: Path
+) -> Tuple[str, str]:
     access_path = secrets_path / f"{institution_id}_access_token"
     item_path = secrets_path / f"{institution_id}_item_id"
 
@@ -33,3 +84,30 @@ def load_credentials(
     access_token = read_secret_required(access_path, label="access_token")
 
     return item_id, access_token
+
+
+def clear_credentials_cache() -> None:
+    """Forget credentials cached by load_credentials()."""
+
+    _load_credentials_cached.cache_clear()
+
+
+def secrets_dir_fingerprint(secrets_dir: Path) -> Tuple[Tuple[str, int], ...]:
+    """Return sorted (name, mtime_ns) pairs for the files in secrets_dir.
+
+    Writing, removing or renaming any secret changes the fingerprint, so it can
+    key caches of data derived from the saved credentials. Dotfiles hold such
+    derived data rather than secrets and are skipped.
+    """
+
+    try:
+        with os.scandir(secrets_dir) as entries:
+            return tuple(
+                sorted(
+                    (entry.name, entry.stat().st_mtime_ns)
+                    for entry in entries
+                    if entry.is_file() and not entry.name.startswith(".")
+                )
+            )
+    except FileNotFoundError:
+        return ()
@@ -7,11 +7,14 @@ Code initially copied from [Plaid's Python Quickstart](https://github.com/plaid/
 
 import os
 import datetime as dt
+import functools
 import json
 import time
-from typing import Any, Callable, Dict, List, Optional
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Mapping, Optional, Tuple
 
-from flask import Flask, request, jsonify
 from loguru import logger
 import plaid
 from plaid.model.products import Products
@@ -35,12 +38,37 @@ from plaid.model.investments_holdings_get_request import InvestmentsHoldingsGetR
 from plaid.model.item_get_request import ItemGetRequest
 from plaid.model.institutions_get_by_id_request import InstitutionsGetByIdRequest
 from plaid.api import plaid_api
-from yapcli.utils import default_secrets_dir
+from yapcli.secrets import clear_credentials_cache, write_secret
+from yapcli.utils import MAX_CONCURRENT_REQUESTS, default_secrets_dir
+
+if TYPE_CHECKING:
+    from flask import Flask
+
+try:  # optional: faster serialization for debug dumps of large responses
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None  # type: ignore[assignment]
 
 DEFAULT_PLAID_REDIRECT_URI = ""
 DEFAULT_LINK_DAYS_REQUESTED = 365
 
 
+def _dump_json(value: Any) -> str:
+    """Serialize ``value`` as indented JSON, stringifying unsupported types."""
+
+    if orjson is not None:
+        # orjson handles date/datetime natively, so default=str only runs for
+        # rare leaves (e.g. Decimal). Plaid payloads only have str keys; fall
+        # back to the stdlib for anything orjson rejects.
+        try:
+            return orjson.dumps(value, default=str, option=orjson.OPT_INDENT_2).decode(
+                "utf-8"
+            )
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(value, indent=2, default=str)
+
+
 def _empty_to_none(env: Dict[str, str], field: str) -> Optional[str]:
     value = env.get(field)
     if value is None or len(value) == 0:
@@ -48,6 +76,27 @@ def _empty_to_none(env: Dict[str, str], field: str) -> Optional[str]:
     return value
 
 
+# Keys that feed _resolve_plaid_env_and_secret, in cache-key order.
+_PLAID_ENV_SECRET_KEYS = (
+    "PLAID_ENV",
+    "PLAID_SANDBOX_SECRET",
+    "PLAID_PRODUCTION_SECRET",
+    "PLAID_SECRET",
+)
+
+
+def plaid_settings_key(
+    env: Optional[Mapping[str, str]] = None,
+) -> Tuple[Optional[str], ...]:
+    """Return the env values that determine which Plaid app/environment is used."""
+
+    source = env if env is not None else os.environ
+    return tuple(
+        source.get(key)
+        for key in ("PLAID_CLIENT_ID", *_PLAID_ENV_SECRET_KEYS, "PLAID_COUNTRY_CODES")
+    )
+
+
 def _resolve_plaid_env_and_secret(env: Dict[str, str]) -> tuple[str, Optional[str]]:
     """Resolve effective Plaid environment + secret.
 
@@ -60,9 +109,16 @@ def _resolve_plaid_env_and_secret(env: Dict[str, str]) -> tuple[str, Optional[st
       PLAID_PRODUCTION_SECRET).
     """
 
-    explicit_env = _empty_to_none(env, "PLAID_ENV")
-    sandbox_secret = _empty_to_none(env, "PLAID_SANDBOX_SECRET")
-    production_secret = _empty_to_none(env, "PLAID_PRODUCTION_SECRET")
+    return _resolve_plaid_env_and_secret_cached(
+        tuple(_empty_to_none(env, key) for key in _PLAID_ENV_SECRET_KEYS)
+    )
+
+
+@functools.lru_cache(maxsize=64)
+def _resolve_plaid_env_and_secret_cached(
+    values: tuple[Optional[str], ...],
+) -> tuple[str, Optional[str]]:
+    explicit_env, sandbox_secret, production_secret, direct_secret = values
 
     if explicit_env is not None:
         plaid_env = explicit_env
@@ -71,7 +127,6 @@ def _resolve_plaid_env_and_secret(env: Dict[str, str]) -> tuple[str, Optional[st
     else:
         plaid_env = "production"
 
-    direct_secret = _empty_to_none(env, "PLAID_SECRET")
     if direct_secret is not None:
         return plaid_env, direct_secret
 
@@ -106,6 +161,97 @@ def _resolve_link_days_requested(env: Dict[str, str]) -> int:
     return days
 
 
+def _resolve_request_timeout_seconds(env: Dict[str, str]) -> Optional[float]:
+    raw = env.get("YAPCLI_PLAID_TIMEOUT_SECONDS")
+    if raw is None or str(raw).strip() == "":
+        return 10.0
+
+    try:
+        seconds = float(str(raw).strip())
+    except ValueError:
+        logger.warning(
+            "Invalid YAPCLI_PLAID_TIMEOUT_SECONDS={!r}; expected number of seconds; disabling timeout",
+            raw,
+        )
+        return None
+
+    if seconds <= 0:
+        return None
+    return seconds
+
+
+@dataclass(frozen=True)
+class BackendConfig:
+    """Environment-derived settings and Plaid API client shared by backends.
+
+    Building this once and passing it to several PlaidBackend instances avoids
+    re-resolving the environment and re-creating the Plaid API client for each.
+    """
+
+    env: Mapping[str, str]
+    plaid_client_id: Optional[str]
+    plaid_env: str
+    plaid_secret: Optional[str]
+    plaid_country_codes: Tuple[str, ...]
+    secrets_dir: Path
+    request_timeout_seconds: Optional[float]
+    client: plaid_api.PlaidApi
+
+    @classmethod
+    def from_env(cls, env: Optional[Dict[str, str]] = None) -> "BackendConfig":
+        resolved_env = dict(env) if env is not None else dict(os.environ)
+
+        plaid_client_id = resolved_env.get("PLAID_CLIENT_ID")
+        plaid_env, plaid_secret = _resolve_plaid_env_and_secret(resolved_env)
+
+        host = plaid.Environment.Sandbox
+        if plaid_env == "sandbox":
+            host = plaid.Environment.Sandbox
+        if plaid_env == "production":
+            host = plaid.Environment.Production
+
+        configuration = plaid.Configuration(
+            host=host,
+            api_key={
+                "clientId": plaid_client_id,
+                "secret": plaid_secret,
+                "plaidVersion": "2020-09-14",
+            },
+        )
+        # Concurrent discovery shares this client; keep enough pooled
+        # keep-alive connections for every worker.
+        configuration.connection_pool_maxsize = MAX_CONCURRENT_REQUESTS
+        api_client = plaid.ApiClient(configuration)
+
+        return cls(
+            env=MappingProxyType(resolved_env),
+            plaid_client_id=plaid_client_id,
+            plaid_env=plaid_env,
+            plaid_secret=plaid_secret,
+            plaid_country_codes=tuple(
+                resolved_env.get("PLAID_COUNTRY_CODES", "US,CA").split(",")
+            ),
+            secrets_dir=default_secrets_dir(resolved_env),
+            request_timeout_seconds=_resolve_request_timeout_seconds(resolved_env),
+            client=plaid_api.PlaidApi(api_client),
+        )
+
+    @classmethod
+    def shared(cls) -> "BackendConfig":
+        """Return a config for os.environ, reused while the environment is unchanged.
+
+        Backends built from the shared config reuse one Plaid API client and
+        its connection pool instead of opening new connections per backend.
+        """
+
+        return _shared_backend_config(frozenset(os.environ.items()))
+
+
+@functools.lru_cache(maxsize=4)
+def _shared_backend_config(environ: frozenset[Tuple[str, str]]) -> BackendConfig:
+    return BackendConfig.from_env(dict(environ))
+
+
 class PlaidBackend:
     """Encapsulates Plaid client + credential state.
 
@@ -114,6 +260,11 @@ class PlaidBackend:
     methods.
     """
 
+    # transactions/sync can transiently return an empty next_cursor; retry this
+    # many times (waiting between attempts) before giving up.
+    EMPTY_NEXT_CURSOR_RETRIES = 2
+    EMPTY_NEXT_CURSOR_RETRY_DELAY_SECONDS = 2
+
     def __init__(
         self,
         *,
@@ -121,39 +272,34 @@ class PlaidBackend:
         access_token: Optional[str] = None,
         item_id: Optional[str] = None,
         products: Optional[List[str]] = None,
+        config: Optional[BackendConfig] = None,
     ) -> None:
-        self._env: Dict[str, str] = dict(env) if env is not None else dict(os.environ)
+        """Create a backend from ``env`` (default: os.environ).
+
+        Pass a prebuilt ``config`` instead of ``env`` when constructing many
+        backends for the same environment (e.g. one per saved institution).
+        """
+
+        if config is None:
+            config = (
+                BackendConfig.shared() if env is None else BackendConfig.from_env(env)
+            )
+
+        self._env: Dict[str, str] = dict(config.env)
 
-        self.plaid_client_id = self._env.get("PLAID_CLIENT_ID")
-        self.plaid_env, self.plaid_secret = _resolve_plaid_env_and_secret(self._env)
+        self.plaid_client_id = config.plaid_client_id
+        self.plaid_env = config.plaid_env
+        self.plaid_secret = config.plaid_secret
         self.plaid_products = products or ["transactions"]
-        self.plaid_country_codes = self._env.get("PLAID_COUNTRY_CODES", "US,CA").split(
-            ","
-        )
-        self.secrets_dir = default_secrets_dir(self._env)
+        self.plaid_country_codes = list(config.plaid_country_codes)
+        self.secrets_dir = config.secrets_dir
 
         # Parameters used for the OAuth redirect Link flow.
         # Redirect URIs are intentionally not configurable via environment variables.
         self.plaid_redirect_uri = DEFAULT_PLAID_REDIRECT_URI
 
-        host = plaid.Environment.Sandbox
-        if self.plaid_env == "sandbox":
-            host = plaid.Environment.Sandbox
-        if self.plaid_env == "production":
-            host = plaid.Environment.Production
-
-        configuration = plaid.Configuration(
-            host=host,
-            api_key={
-                "clientId": self.plaid_client_id,
-                "secret": self.plaid_secret,
-                "plaidVersion": "2020-09-14",
-            },
-        )
-        api_client = plaid.ApiClient(configuration)
-        self.client = plaid_api.PlaidApi(api_client)
-
-        self._request_timeout_seconds = self._resolve_request_timeout_seconds()
+        self.client = config.client
+        self._request_timeout_seconds = config.request_timeout_seconds
 
         # We store the access_token in memory - in production, store it in a secure
         # persistent data store.
@@ -190,33 +336,24 @@ class PlaidBackend:
 
         self.products = [Products(product) for product in self.plaid_products]
 
-        self.app = Flask(__name__)
-        self._register_routes(self.app)
+    @functools.cached_property
+    def app(self) -> "Flask":
+        # Only `yapcli backend` serves HTTP; build the Flask app (and import
+        # flask) on first use so the export commands don't pay for it.
+        from flask import Flask
 
-    def _resolve_request_timeout_seconds(self) -> Optional[float]:
-        raw = self._env.get("YAPCLI_PLAID_TIMEOUT_SECONDS")
-        if raw is None or str(raw).strip() == "":
-            return 10.0
-
-        try:
-            seconds = float(str(raw).strip())
-        except ValueError:
-            logger.warning(
-                "Invalid YAPCLI_PLAID_TIMEOUT_SECONDS={!r}; expected number of seconds; disabling timeout",
-                raw,
-            )
-            return None
-
-        if seconds <= 0:
-            return None
-        return seconds
+        app = Flask(__name__)
+        self._register_routes(app)
+        return app
 
     def _timeout_kwargs(self) -> Dict[str, Any]:
         if self._request_timeout_seconds is None:
             return {}
         return {"_request_timeout": self._request_timeout_seconds}
 
-    def _register_routes(self, app: Flask) -> None:
+    def _register_routes(self, app: "Flask") -> None:
+        from flask import jsonify, request
+
         @app.route("/api/info", methods=["POST"])
         def info_route():
             return jsonify(self.info())
@@ -335,7 +472,7 @@ class PlaidBackend:
         removed: List[Dict[str, Any]] = []
         has_more = True
         empty_next_cursor_retries = 0
-        max_empty_next_cursor_retries = 2
+        max_empty_next_cursor_retries = self.EMPTY_NEXT_CURSOR_RETRIES
         logger.debug(
             "transactions_sync start: account_id={} access_token_set={} initial_cursor={!r}",
             account_id,
@@ -378,6 +515,9 @@ class PlaidBackend:
                 has_more = response["has_more"]
                 next_cursor = response["next_cursor"]
                 if next_cursor == "":
+                    if not has_more:
+                        # Nothing left to fetch, so waiting to retry is pointless.
+                        break
                     if empty_next_cursor_retries >= max_empty_next_cursor_retries:
                         logger.warning(
                             "transactions_sync next_cursor empty after {} retries; stopping to avoid hanging (account_id={} has_more={} current_cursor={!r})",
@@ -406,12 +546,13 @@ class PlaidBackend:
 
                     empty_next_cursor_retries += 1
                     logger.debug(
-                        "transactions_sync next_cursor empty; sleeping 2s then retrying (attempt {}/{}; has_more currently={})",
+                        "transactions_sync next_cursor empty; sleeping {}s then retrying (attempt {}/{}; has_more currently={})",
+                        self.EMPTY_NEXT_CURSOR_RETRY_DELAY_SECONDS,
                         empty_next_cursor_retries,
                         max_empty_next_cursor_retries,
                         response.get("has_more"),
                     )
-                    time.sleep(2)
+                    time.sleep(self.EMPTY_NEXT_CURSOR_RETRY_DELAY_SECONDS)
                     continue
 
                 cursor = next_cursor
@@ -455,8 +596,9 @@ class PlaidBackend:
             balance_response = self.client.accounts_balance_get(
                 balance_request, **self._timeout_kwargs()
             )
-            self.pretty_print_response(balance_response.to_dict())
-            return balance_response.to_dict()
+            payload = balance_response.to_dict()
+            self.pretty_print_response(payload)
+            return payload
         except plaid.ApiException as exc:
             return self.format_error(exc)
 
@@ -466,8 +608,9 @@ class PlaidBackend:
             response = self.client.accounts_get(
                 accounts_request, **self._timeout_kwargs()
             )
-            self.pretty_print_response(response.to_dict())
-            return response.to_dict()
+            payload = response.to_dict()
+            self.pretty_print_response(payload)
+            return payload
         except plaid.ApiException as exc:
             return self.format_error(exc)
 
@@ -479,8 +622,9 @@ class PlaidBackend:
             response = self.client.investments_holdings_get(
                 holdings_request, **self._timeout_kwargs()
             )
-            self.pretty_print_response(response.to_dict())
-            return {"error": None, "holdings": response.to_dict()}
+            payload = response.to_dict()
+            self.pretty_print_response(payload)
+            return {"error": None, "holdings": payload}
         except plaid.ApiException as exc:
             return self.format_error(exc)
 
@@ -507,8 +651,9 @@ class PlaidBackend:
             response = self.client.investments_transactions_get(
                 investments_request, **self._timeout_kwargs()
             )
-            self.pretty_print_response(response.to_dict())
-            return {"error": None, "investments_transactions": response.to_dict()}
+            payload = response.to_dict()
+            self.pretty_print_response(payload)
+            return {"error": None, "investments_transactions": payload}
         except plaid.ApiException as exc:
             return self.format_error(exc)
 
@@ -569,7 +714,9 @@ class PlaidBackend:
 
     @staticmethod
     def pretty_print_response(response: Any) -> None:
-        logger.debug(json.dumps(response, indent=2, sort_keys=True, default=str))
+        # lazy=True: the dump only runs when a sink accepts DEBUG, so large
+        # payloads are not serialized just to be discarded.
+        logger.opt(lazy=True).debug("{}", lambda: _dump_json(response))
 
     @staticmethod
     def format_error(exc: plaid.ApiException) -> Dict[str, Any]:
@@ -596,7 +743,10 @@ class PlaidBackend:
 
         try:
             self.secrets_dir.mkdir(parents=True, exist_ok=True)
-            (self.secrets_dir / f"{identifier}_item_id").write_text(item_id or "")
-            (self.secrets_dir / f"{identifier}_access_token").write_text(token or "")
+            # The access token goes last: once it appears, its item_id is
+            # already complete.
+            write_secret(self.secrets_dir / f"{identifier}_item_id", item_id or "")
+            write_secret(self.secrets_dir / f"{identifier}_access_token", token or "")
+            clear_credentials_cache()
         except OSError as exc:
             logger.warning("Unable to write tokens to {}: {}", self.secrets_dir, exc)